@@ -0,0 +1,146 @@
+import time
+
+from .FrameDiff import DiffEncoder
+
+
+__all__ = ['Animation']
+
+
+class Animation(object):
+    '''
+       Sequence of frames compiled once, and played on a fixed schedule
+
+       Frames are anything the device's packFrame() accepts; pixels for
+       EightByEight, color codes for BiColor, characters for FourDigit,
+       or raw 16 byte buffers for any Device. Each frame is packed into
+       a display RAM image when the animation is created; so, playback
+       only sends bytes that changed between frames.
+
+       Frame deadlines are computed from the start time, rather than
+       by sleeping a fixed delay after each write; so, bus time never
+       accumulates as drift. When playback falls a whole frame behind,
+       late frames are dropped to catch up.
+
+       With diffs=True, only the first frame is kept whole; every step
+       of the sequence is stored as a Diff (see DiffEncoder), and sent
+       with writeDiff(). Long sequences then take less memory, and no
+       frame comparison happens during playback.
+
+       Example:
+       >>> from HT16K33 import FourDigit
+       >>> digit = FourDigit().setUp()
+       >>> spinner = Animation(digit, [[0x01] * 4, [0x02] * 4, [0x04] * 4], fps=200)
+       >>> spinner.play(loops=2).shown + spinner.dropped
+       6
+       >>> spinner = Animation(digit, [[0x01] * 4, [0x02] * 4, [0x04] * 4], fps=200, diffs=True)
+       >>> [diff.transactions for diff in spinner.diffs]
+       [2, 2, 2]
+       >>> spinner.play(loops=2).shown + spinner.dropped
+       6
+       >>> late = Animation(digit, [[0x01] * 4, [0x02] * 4, [0x04] * 4, [0x08, 0, 0, 0]], mode="once", diffs=True)
+       >>> clock = iter([0.0, 0.35]).__next__  # first frame is already 3 frames late
+       >>> late.play(clock=clock).dropped, digit.readAtPosition(0), digit.readAtPosition(1)
+       (3, 8, 0)
+    '''
+
+    LOOP = "loop"
+    PING_PONG = "pingpong"
+    ONCE = "once"
+
+    def __init__(self, device, frames, fps=10, mode="loop", diffs=False):
+        if mode not in (self.LOOP, self.PING_PONG, self.ONCE):
+            raise ValueError("Unknown animation mode %r" % mode)
+        self.device = device
+        self.fps = float(fps)
+        self.mode = mode
+        self.frames = [bytes(device.packFrame(frame)) for frame in frames]
+        self.length = len(self.frames)
+        self.diffs = None
+        if diffs and self.frames:
+            # diffs[i] goes from step i of the sequence to step i + 1
+            sequence = self.getSequence()
+            encoder = DiffEncoder(self.frames[sequence[0]], device)
+            self.diffs = [encoder.encode(self.frames[sequence[(step + 1) % len(sequence)]])
+                          for step in range(len(sequence))]
+            self.frames = [self.frames[sequence[0]]]
+        self.playing = False
+        self.shown = 0
+        self.dropped = 0
+
+    def getSequence(self):
+        '''
+           Return frame indexes making up one loop of the animation
+
+           Example:
+           >>> from HT16K33._HT16K33 import Device
+           >>> Animation(Device(), [[1], [2], [3], [4]], mode="pingpong").getSequence()
+           [0, 1, 2, 3, 2, 1]
+        '''
+        sequence = list(range(self.length))
+        if self.mode == self.PING_PONG:
+            sequence += sequence[-2:0:-1]
+        return sequence
+
+    def play(self, loops=None, clock=time.monotonic, sleep=time.sleep):
+        '''
+           Emit frames on the device until done, or stop() is called
+           - loops (int, default None) number of loops, None is forever
+           - clock (callable, default time.monotonic)
+           - sleep (callable, default time.sleep)
+
+           An animation in "once" mode always plays a single loop.
+           Counters shown & dropped hold the result.
+        '''
+        sequence = self.getSequence()
+        if not sequence:
+            return self
+        if self.mode == self.ONCE:
+            loops = 1
+        total = None if loops is None else int(loops) * len(sequence)
+        period = 1.0 / self.fps
+        self.shown = self.dropped = 0
+        self.playing = True
+        start = clock()
+        tick = 0
+        shown = None
+        while self.playing and (total is None or tick < total):
+            deadline = start + tick * period
+            now = clock()
+            if now < deadline:
+                sleep(deadline - now)
+            else:
+                late = int((now - deadline) / period)
+                if total is not None:
+                    late = min(late, total - 1 - tick)
+                tick += late
+                self.dropped += late
+            if self.diffs is None:
+                self.device.writeFrame(self.frames[sequence[tick % len(sequence)]])
+            elif shown is not None and tick == shown + 1:
+                self.device.writeDiff(self.diffs[shown % len(sequence)])
+            else:
+                # Skip dropped frames; a whole loop of diffs is a no-op
+                with self.device.batch():
+                    if shown is None:
+                        # Diffs start from the first frame, even if late
+                        self.device.writeFrame(self.frames[0])
+                        shown = 0
+                    for step in range(shown, shown + (tick - shown) % len(sequence)):
+                        self.device.writeDiff(self.diffs[step % len(sequence)])
+            shown = tick
+            self.shown += 1
+            tick += 1
+        self.playing = False
+        return self
+
+    def stop(self):
+        '''
+           Stop playback after the current frame (i.e. from another thread)
+        '''
+        self.playing = False
+        return self
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,220 @@
+import mmap
+import struct
+import time
+
+from .FrameDiff import Diff, DiffEncoder
+
+
+__all__ = ['AnimationFile']
+
+
+class AnimationFile(object):
+    '''
+       Packed animation file, played straight from a memory map
+
+       Layout (little endian):
+       - header: MAGIC, version, device type, reserved (2 bytes) &
+         frame count (uint32)
+       - one record per frame: kind, run count, duration (uint16
+         milliseconds) & changed register mask (uint16), then
+       -- FULL: the 16 byte display RAM image
+       -- DIFF: run count times start register, length & bytes
+
+       Diff records hold the transactions planned by DiffEncoder; the
+       writer keeps whichever record is smaller. The first frame is
+       always FULL, so loops restart cleanly. Playback hands memoryview
+       slices of the map to writeFrame() & writeDiff(); nothing is
+       copied or loaded up front, so resident memory stays the same
+       for any animation length.
+
+       - path (file name)
+
+       Example:
+       >>> import os, tempfile
+       >>> from HT16K33 import EightByEight
+       >>> matrix = EightByEight(backend="emulator").setUp()
+       >>> frames = [[[y <= row] * 8 for y in range(8)] for row in range(8)]
+       >>> path = os.path.join(tempfile.mkdtemp(), "fill.ht16k33")
+       >>> AnimationFile.write(path, matrix, frames, durations=0.001)
+       8
+       >>> with AnimationFile(path) as animation:
+       ...   animation.device, len(animation), animation.play(matrix).shown + animation.dropped
+       ('EightByEight', 8, 8)
+       >>> matrix.getFrame()[7]
+       [True, True, True, True, True, True, True, True]
+       >>> os.path.getsize(path)  # header, FULL record, 7 single byte DIFF records
+       101
+    '''
+
+    MAGIC = b"HT16K33A"
+    VERSION = 1
+    HEADER = struct.Struct("<8sBBHI")
+    RECORD = struct.Struct("<BBHH")
+    RUN = struct.Struct("<BB")
+    FULL = 0
+    DIFF = 1
+    # Device type stored in the header; 0 plays on any device
+    DEVICES = ("Device", "EightByEight", "BiColor", "FourDigit")
+    RAM_SIZE = 0x10
+    # Played pages are dropped from memory every RELEASE_SIZE bytes
+    RELEASE_SIZE = 1 << 16
+    DONT_NEED = getattr(mmap, "MADV_DONTNEED", None) if hasattr(mmap.mmap, "madvise") else None
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.DONT_NEED is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self.map.madvise(mmap.MADV_SEQUENTIAL)
+        self.view = memoryview(self.map)
+        magic, version, device, reserved, self.frames = self.HEADER.unpack_from(self.view, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError("Not a HT16K33 animation file (version %d)" % self.VERSION)
+        self.device = self.DEVICES[device] if device < len(self.DEVICES) else self.DEVICES[0]
+        self.playing = False
+        self.shown = 0
+        self.dropped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.frames
+
+    def close(self):
+        '''
+           Unmap & close the file (every frame view must be released)
+        '''
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+            self.map.close()
+            self.file.close()
+        return self
+
+    def play(self, device, loops=1, speed=1.0, clock=time.monotonic, sleep=time.sleep):
+        '''
+           Emit frames on device until done, or stop() is called
+           - device (matching the file's device type)
+           - loops (int, default 1) None is forever
+           - speed (float, default 1.0) scales frame durations
+
+           Frames whose time is already over are only merged into the
+           shadow RAM, and sent along with the next frame shown.
+           Counters shown & dropped hold the result.
+        '''
+        if self.device != self.DEVICES[0] and self.device not in [cls.__name__ for cls in type(device).__mro__]:
+            raise ValueError("Animation is for %s, not %s" % (self.device, type(device).__name__))
+        deferred = device.deferred
+        self.shown = self.dropped = 0
+        self.playing = True
+        loop = 0
+        deadline = clock()
+        try:
+            while self.playing and (loops is None or loop < loops):
+                for index, (duration, frame) in enumerate(self.records()):
+                    if not self.playing:
+                        break
+                    end = deadline + duration / speed
+                    last = index == self.frames - 1 and loops is not None and loop == loops - 1
+                    if clock() >= end and not last:
+                        device.deferred = True
+                        self.dropped += 1
+                    else:
+                        delay = deadline - clock()
+                        if delay > 0:
+                            sleep(delay)
+                        device.deferred = deferred
+                        self.shown += 1
+                    if isinstance(frame, Diff):
+                        device.writeDiff(frame)
+                    else:
+                        device.writeFrame(frame)
+                    deadline = end
+                loop += 1
+        finally:
+            device.deferred = deferred
+            if not deferred and device.dirty:
+                device.flush()
+            self.playing = False
+        return self
+
+    def records(self):
+        '''
+           Iterate (duration seconds, frame) of every record; frame is a
+           16 byte memoryview (FULL), or a Diff of memoryviews (DIFF)
+        '''
+        view = self.view
+        offset = self.HEADER.size
+        released = 0
+        for index in range(self.frames):
+            if offset - released >= self.RELEASE_SIZE and self.DONT_NEED is not None:
+                # Drop pages already played from resident memory
+                end = offset - offset % mmap.PAGESIZE
+                self.map.madvise(self.DONT_NEED, released, end - released)
+                released = end
+            kind, runs, duration, mask = self.RECORD.unpack_from(view, offset)
+            offset += self.RECORD.size
+            if kind == self.FULL:
+                frame = view[offset:offset + self.RAM_SIZE]
+                offset += self.RAM_SIZE
+            else:
+                writes = []
+                for run in range(runs):
+                    start, length = self.RUN.unpack_from(view, offset)
+                    offset += self.RUN.size
+                    writes.append((start, view[offset:offset + length]))
+                    offset += length
+                frame = Diff(mask, tuple(writes))
+            yield duration / 1000.0, frame
+
+    def stop(self):
+        '''
+           Stop playback after the current frame (i.e. from another thread)
+        '''
+        self.playing = False
+        return self
+
+    @classmethod
+    def write(cls, path, device, frames, durations=0.1, diffs=True):
+        '''
+           Pack frames into an animation file; returns frame count
+           - path (file name)
+           - device (instance packing frames, see Device.packFrame)
+           - frames (iterable; consumed one frame at a time)
+           - durations (seconds; one for all frames, or one per frame)
+           - diffs (Boolean, default True) store DIFF records when smaller
+        '''
+        deviceType = next((cls.DEVICES.index(klass.__name__) for klass in type(device).__mro__
+                           if klass.__name__ in cls.DEVICES), 0)
+        if isinstance(durations, (int, float)):
+            durations = [durations]
+        encoder = DiffEncoder(planner=device)
+        count = 0
+        with open(path, "wb") as stream:
+            stream.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, 0, 0, 0))
+            for index, frame in enumerate(frames):
+                frame = bytes(device.packFrame(frame))
+                duration = durations[index] if index < len(durations) else durations[-1]
+                duration = min(max(int(round(duration * 1000)), 0), 0xFFFF)
+                diff = encoder.encode(frame)
+                frame = bytes(encoder.previous)
+                length = sum(cls.RUN.size + len(data) for start, data in diff.writes)
+                if diffs and index and length < cls.RAM_SIZE:
+                    stream.write(cls.RECORD.pack(cls.DIFF, len(diff.writes), duration, diff.mask))
+                    for start, data in diff.writes:
+                        stream.write(cls.RUN.pack(start, len(data)) + data)
+                else:
+                    stream.write(cls.RECORD.pack(cls.FULL, 1, duration, 0xFFFF) + frame)
+                count += 1
+            stream.seek(0)
+            stream.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, deviceType, 0, count))
+        return count
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+
+from .BiColor import BiColor
+from .EightByEight import EightByEight
+from .FourDigit import FourDigit
+from ._HT16K33 import Device
+
+
+__all__ = ['AsyncBiColor', 'AsyncDevice', 'AsyncEightByEight', 'AsyncFourDigit']
+
+
+class AsyncDevice(object):
+    '''
+       asyncio flavour of a HT16K33 device
+
+       Wraps a blocking device (see DEVICE), and exposes each of its
+       public methods as a coroutine. Calls run on the executor
+       dedicated to the device's bus (see Device.getExecutor); so,
+       the event loop never blocks on i2c, devices on different buses
+       update concurrently, and calls on the same bus keep their order.
+       Methods returning the wrapped device return this object instead.
+
+       Example:
+       >>> async def demo():
+       ...   matrix = await AsyncEightByEight().setUp()
+       ...   await matrix.setRow(0, 0xFF)
+       ...   return await matrix.readRAM(0x00)
+       ...
+       >>> asyncio.run(demo())
+       255
+    '''
+
+    DEVICE = Device
+
+    def __init__(self, **kwargs):
+        self.device = self.DEVICE(**kwargs)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.device, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def method(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.device.getExecutor(),
+                                                functools.partial(attribute, *args, **kwargs))
+            return self if result is self.device else result
+        return method
+
+    @asynccontextmanager
+    async def batch(self):
+        '''
+           Async context manager coalescing all display RAM writes
+
+           Same as Device.batch(), but the final flush is awaited on
+           the bus executor.
+
+           Example:
+           >>> async def demo():
+           ...   matrix = await AsyncEightByEight().setUp()
+           ...   async with matrix.batch():
+           ...     for row in range(8):
+           ...       await matrix.setRow(row, 0xFF)
+           ...   return matrix.dirty
+           ...
+           >>> asyncio.run(demo())
+           0
+        '''
+        deferred = self.device.deferred
+        self.device.deferred = True
+        try:
+            yield self
+        finally:
+            self.device.deferred = deferred
+            if not deferred:
+                await self.flush()
+
+
+class AsyncBiColor(AsyncDevice):
+    '''
+       asyncio flavour of BiColor
+    '''
+    DEVICE = BiColor
+
+
+class AsyncEightByEight(AsyncDevice):
+    '''
+       asyncio flavour of EightByEight
+    '''
+    DEVICE = EightByEight
+
+
+class AsyncFourDigit(AsyncDevice):
+    '''
+       asyncio flavour of FourDigit
+    '''
+    DEVICE = FourDigit
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,4 @@
-from ._HT16K33 import Device
+from ._HT16K33 import Device, _packPlanes, _transpose, _UNPACK
 
 
 __all__ = ['BiColor']
@@ -13,6 +13,11 @@ class BiColor(Device):
   RED_COLUMN_ADDRESS  =(0x0F, 0x0D, 0x0B, 0x09, 0x07, 0x05, 0x03, 0x01)
   ROW_VALUES=(0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80)
 
+  OFF=0x00
+  GREEN=0x01
+  RED=0x02
+  YELLOW=0x03
+
   def alterSingleLED(self, x, y, action, isRed=False):
     '''
        Manipulate single lead at point (x, y)
@@ -29,18 +34,18 @@ class BiColor(Device):
        >>> square.alterSingleLED(0, 4,"xor", True)     # Same yellow set to green
        >>> square.alterSingleLED(0, 4,"andnot", False) # Turn off new green LED
     '''
-    column_address = self.getColumnAddressByIndex(x, isRed)
-    new_byte = self.getRowValue(y)
-    byte = self.bus.read_byte_data(self.address, column_address)
-    if action == "or":
-        byte |= new_byte
-    elif action == "xor":
-        byte ^= new_byte
-    elif action == "andnot":
-        byte &= ~new_byte
-    else:
-        byte = new_byte
-    self.bus.write_byte_data(self.address, column_address, byte)
+    self.alterRAM(self.getColumnAddressByIndex(x, isRed), self.getRowValue(y), action)
+
+  def fromPlanes(self, planes):
+    '''
+       Join green & red 8x8 bit planes (64-bit integers; byte n is row
+       n, bit m is column m) into a display RAM image
+    '''
+    frame = bytearray(self.RAM_SIZE)
+    # Display RAM holds columns; so, planes are transposed
+    frame[14::-2] = _transpose(planes[0]).to_bytes(8, "little")
+    frame[15::-2] = _transpose(planes[1]).to_bytes(8, "little")
+    return frame
 
   def getColumnAddressByIndex(self, column, isRed=False):
     '''
@@ -57,6 +62,27 @@ class BiColor(Device):
     column = int(column) % 0x08
     return self.RED_COLUMN_ADDRESS[column] if isRed else self.GREEN_COLUMN_ADDRESS[column]
 
+  def getImage(self):
+    '''
+       Return current image as 8 rows of 8 color codes (from shadow RAM)
+       - 0 = OFF, 1 = GREEN, 2 = RED, 3 = YELLOW
+
+       Example:
+       >>> square = BiColor().setUp()
+       >>> square.turnOnRedLED(1, 0)
+       >>> square.turnOnGreenLED(2, 0)
+       >>> square.turnOnRedLED(2, 0)
+       >>> square.getImage()[0]
+       [0, 2, 3, 0, 0, 0, 0, 0]
+    '''
+    image = [[self.OFF] * 8 for row in range(8)]
+    for x in range(8):
+      green = bytearray(_UNPACK[self.buffer[self.GREEN_COLUMN_ADDRESS[x]]])
+      red = bytearray(_UNPACK[self.buffer[self.RED_COLUMN_ADDRESS[x]]])
+      for y in range(8):
+        image[y][x] = green[y] | (red[y] << 1)
+    return image
+
   def getRowValue(self, position=0x00):
     '''
        Retrieve value of row position
@@ -70,6 +96,46 @@ class BiColor(Device):
     '''
     return self.ROW_VALUES[int(position) % 0x08]
 
+  def packColumns(self, green, red=None):
+    '''
+       Convert column bytes into a 16 byte display RAM image
+       - green (8 bytes, left to right; bit 0 is the top row)
+       - red (8 bytes, default None for no red)
+
+       Column bytes are already in display RAM order; so, they are
+       copied with two slice assignments. Nothing is sent to the device.
+
+       Example:
+       >>> frame = BiColor().packColumns(bytearray([0xFF] + [0] * 7), bytearray([0] * 7 + [0x01]))
+       >>> frame[0x0E], frame[0x0F], frame[0x01]
+       (255, 0, 1)
+    '''
+    frame = bytearray(self.RAM_SIZE)
+    # GREEN_COLUMN_ADDRESS & RED_COLUMN_ADDRESS run backwards, 2 apart
+    frame[14::-2] = green[:8]
+    if red is not None:
+      frame[15::-2] = red[:8]
+    return frame
+
+  def packFrame(self, pixels):
+    '''
+       Convert 8x8 color codes into a 16 byte display RAM image
+       - pixels (see setImage)
+
+       Nothing is sent to the device.
+
+       Example:
+       >>> frame = BiColor().packFrame([[BiColor.YELLOW] + [BiColor.OFF] * 7] * 8)
+       >>> frame[0x0E], frame[0x0F], frame[0x00]
+       (255, 255, 0)
+    '''
+    green, red = _packPlanes(pixels, (self.GREEN, self.RED), True)
+    frame = bytearray(self.RAM_SIZE)
+    for x in range(8):
+      frame[self.GREEN_COLUMN_ADDRESS[x]] = green[x]
+      frame[self.RED_COLUMN_ADDRESS[x]] = red[x]
+    return frame
+
   def setColumn(self, column=0, value=0x00, isRed=False):
     '''
        Assign all LEDs in a given column
@@ -86,7 +152,40 @@ class BiColor(Device):
     '''
     column_address=self.getColumnAddressByIndex(column, isRed)
     value=int(value) % 0x100
-    self.bus.write_byte_data(self.address, column_address, value)
+    self.writeRAM(column_address, value)
+
+  def setImage(self, pixels):
+    '''
+       Replace whole image, and send all 16 bytes with a single flush
+       - pixels (8x8 color codes; NumPy array, nested lists or buffer)
+       -- 0 = OFF
+       -- 1 = GREEN
+       -- 2 = RED
+       -- 3 = YELLOW
+
+       Pixels are split into green & red column planes, eight at a time
+       (or vectorized, for NumPy arrays.)
+
+       Example:
+       >>> square = BiColor().setUp()
+       >>> square.setImage([[(x + y) % 4 for x in range(8)] for y in range(8)])
+       >>> square.getImage()[1]
+       [1, 2, 3, 0, 1, 2, 3, 0]
+    '''
+    self.writeFrame(self.packFrame(pixels))
+
+  def toPlanes(self, frame):
+    '''
+       Split a display RAM image into green & red 8x8 bit planes (see
+       fromPlanes)
+
+       Example:
+       >>> square = BiColor()
+       >>> [hex(plane) for plane in square.toPlanes(square.packFrame([[BiColor.RED] + [BiColor.OFF] * 7] * 8))]
+       ['0x0', '0x101010101010101']
+    '''
+    return [_transpose(int.from_bytes(bytes(frame[14::-2]), "little")),
+            _transpose(int.from_bytes(bytes(frame[15::-2]), "little"))]
 
   def turnOnGreenLED(self, x, y):
     '''
@@ -0,0 +1,100 @@
+import math
+import time
+
+
+__all__ = ['Clock']
+
+
+class Clock(object):
+    '''
+       Wall clock service for a FourDigit display
+
+       Wakes exactly on each second boundary (scheduled on the
+       monotonic clock, and re-aligned if the wall clock is stepped),
+       renders the time, and lets the shadow RAM skip every register
+       whose glyph did not change; usually just the colon, and a digit.
+
+       - digit (FourDigit)
+       - hour24 (Boolean, default True) else 12 hour
+       - seconds (Boolean, default False) show minutes & seconds
+       - blink (Boolean, default True) toggle colon every second
+       - localtime (callable, default time.localtime)
+
+       Example:
+       >>> from HT16K33 import FourDigit
+       >>> digit = FourDigit().setUp()
+       >>> clock = Clock(digit, hour24=False, localtime=time.gmtime)
+       >>> clock.render(22 * 3600 + 5 * 60)
+       ':1005'
+       >>> clock.render(9 * 3600 + 5 * 60 + 1)
+       ' 905'
+       >>> clock.tick(22 * 3600 + 5 * 60).readAtPosition(0)
+       6
+       >>> clock.tick(9 * 3600 + 5 * 60).readAtPosition(0)
+       0
+    '''
+
+    def __init__(self, digit, hour24=True, seconds=False, blink=True, localtime=time.localtime):
+        self.digit = digit
+        self.hour24 = hour24
+        self.seconds = seconds
+        self.blink = blink
+        self.localtime = localtime
+        self.running = False
+
+    def render(self, now):
+        '''
+           Return text displayed at time now (seconds since epoch)
+        '''
+        local = self.localtime(now)
+        if self.seconds:
+            text = "%02d%02d" % (local.tm_min, local.tm_sec)
+        elif self.hour24:
+            text = "%2d%02d" % (local.tm_hour, local.tm_min)
+        else:
+            text = "%2d%02d" % (local.tm_hour % 12 or 12, local.tm_min)
+        if not self.blink or int(now) % 2 == 0:
+            text = ":" + text
+        return text
+
+    def run(self, clock=time.monotonic, sleep=time.sleep, wall=time.time):
+        '''
+           Update the display on every second boundary, until stop()
+        '''
+        self.running = True
+        offset = wall() - clock()
+        deadline = math.floor(clock() + offset) + 1 - offset
+        while self.running:
+            delay = deadline - clock()
+            if delay > 0:
+                sleep(delay)
+            self.tick(deadline + offset)
+            deadline += 1
+            # Re-align after a wall clock step, or a missed second
+            now = clock()
+            if abs(wall() - (now + offset)) > 0.5 or now > deadline:
+                offset = wall() - now
+                deadline = math.floor(now + offset) + 1 - offset
+        return self
+
+    def stop(self):
+        '''
+           Stop run() after the current second (i.e. from another thread)
+        '''
+        self.running = False
+        return self
+
+    def tick(self, now=None):
+        '''
+           Render time now (default current time); only changed
+           registers are written
+        '''
+        if now is None:
+            now = time.time()
+        self.digit.writeString(self.render(now))
+        return self.digit
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
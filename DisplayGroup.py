@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+
+
+__all__ = ['DisplayGroup']
+
+
+class DisplayGroup(object):
+    '''
+       Drive many HT16K33 devices, across several buses, as one wall
+
+       Every broadcast command, and flush(), is split by bus number and
+       queued on each bus's dedicated executor (see Device.getExecutor.)
+       Buses are driven in parallel, devices sharing a bus one after
+       the other; each call returns once every bus is done; so, a whole
+       wall commits a frame together, in about the time of its busiest
+       bus.
+
+       Example:
+       >>> from HT16K33 import EightByEight, FourDigit
+       >>> wall = DisplayGroup([EightByEight(bus=0, address=0x70),
+       ...                      EightByEight(bus=0, address=0x71),
+       ...                      FourDigit(bus=1, address=0x70)]).setUp()
+       >>> with wall.batch():
+       ...   for matrix in wall.devices[:2]:
+       ...     matrix.setRow(0, 0xFF)
+       ...   wall.devices[2].writeDigit(0, 1)
+       ...
+       >>> sorted(wall.getBuses())
+       [0, 1]
+    '''
+
+    def __init__(self, devices=()):
+        self.devices = list(devices)
+
+    def add(self, device):
+        '''
+           Add device to the group
+        '''
+        self.devices.append(device)
+        return self
+
+    @contextmanager
+    def batch(self):
+        '''
+           Context manager deferring RAM writes on every device
+
+           On exit, every device is restored, and those that were not
+           deferred before the block are sent with a single flush();
+           so, like Device.batch(), only the outer most block flushes.
+
+           Example:
+           >>> from HT16K33 import EightByEight
+           >>> wall = DisplayGroup([EightByEight(bus=0, address=0x72, deferred=True),
+           ...                      EightByEight(bus=0, address=0x73)])
+           >>> with wall.batch():
+           ...   for matrix in wall.devices:
+           ...     matrix.setRow(0, 0xFF)
+           ...
+           >>> [bool(matrix.dirty) for matrix in wall.devices]
+           [True, False]
+        '''
+        deferred = [device.deferred for device in self.devices]
+        for device in self.devices:
+            device.deferred = True
+        try:
+            yield self
+        finally:
+            for device, state in zip(self.devices, deferred):
+                device.deferred = state
+            DisplayGroup([device for device, state in zip(self.devices, deferred) if not state]).flush()
+
+    def broadcast(self, method, *args, **kwargs):
+        '''
+           Call method, by name, on every device; one worker per bus
+           - method (str) i.e. "setBrightness"
+
+           Waits for all buses, and raises the first error encountered.
+        '''
+        def run(devices):
+            for device in devices:
+                getattr(device, method)(*args, **kwargs)
+        futures = [devices[0].getExecutor().submit(run, devices)
+                   for devices in self.getBuses().values()]
+        for future in futures:
+            future.result()
+        return self
+
+    def clear(self):
+        '''
+           Clear every device
+        '''
+        return self.broadcast("clear")
+
+    def flush(self):
+        '''
+           Push all pending frames; buses in parallel, then wait for all
+        '''
+        return self.broadcast("flush")
+
+    def getBuses(self):
+        '''
+           Return devices grouped by bus number (dict of lists)
+        '''
+        buses = {}
+        for device in self.devices:
+            buses.setdefault(device.busNumber, []).append(device)
+        return buses
+
+    def setBrightness(self, brightness=0x0F):
+        '''
+           Set brightness level of every device
+           - brightness (0..15)
+        '''
+        return self.broadcast("setBrightness", brightness)
+
+    def setDisplay(self, on=True, blink_rate=0x00):
+        '''
+           Set display options of every device
+           - on (Boolean)
+           - blink_rate (0..3)
+        '''
+        return self.broadcast("setDisplay", on, blink_rate)
+
+    def setUp(self, **kwargs):
+        '''
+           Clear & set default state of every device (see Device.setUp)
+        '''
+        return self.broadcast("setUp", **kwargs)
+
+    def turnOffOscillator(self):
+        '''
+           Disable internal system oscillator of every device
+        '''
+        return self.broadcast("turnOffOscillator")
+
+    def turnOnOscillator(self):
+        '''
+           Enable internal system oscillator of every device
+        '''
+        return self.broadcast("turnOnOscillator")
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
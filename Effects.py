@@ -0,0 +1,242 @@
+import math
+import threading
+import time
+
+
+__all__ = ['Effects']
+
+
+class Effect(object):
+    '''
+       One running effect; curve maps the phase of a cycle (0..1) to
+       intensity (0..1)
+    '''
+
+    def __init__(self, device, curve, period, cycles, brightness, start, finish=None):
+        self.device = device
+        self.curve = curve
+        self.period = float(period)
+        self.cycles = cycles
+        self.brightness = brightness
+        self.start = start
+        self.finish = finish
+
+
+class Effects(object):
+    '''
+       Brightness & blink effects, driven by the chip's PWM dimming
+
+       Every step is at most one brightness command byte; Device caches
+       the last command sent, so a step whose level did not change costs
+       nothing. Frames are never redrawn. A single timer thread steps
+       the effects of every device; it sleeps while there is nothing to
+       do, and each device runs one effect at a time (a new one replaces
+       the old one.)
+
+       Intensity is mapped onto the 16 duty levels through a gamma
+       curve (GAMMA), so fades look even to the eye.
+
+       - fps (steps per second, default 30)
+
+       Example:
+       >>> from HT16K33._HT16K33 import Device
+       >>> bus = Device(backend="emulator").setUp().instrument()
+       >>> effects = Effects()
+       >>> effects = effects.fadeOut(bus, duration=1.0, now=0.0)
+       >>> [effects.step(now) and bus.getBrightness() for now in (0.0, 0.5, 0.9)]
+       [7, 2, 0]
+       >>> effects.step(1.0), bus.getDisplay()
+       (0, (False, 0))
+       >>> bus.instrumentation.transactions
+       3
+    '''
+
+    GAMMA = 2.2
+
+    def __init__(self, fps=30, clock=time.monotonic):
+        self.fps = float(fps)
+        self.clock = clock
+        self.effects = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.running = False
+        self.error = None
+
+    def add(self, device, curve, period=1.0, cycles=None, brightness=15, finish=None, now=None):
+        '''
+           Run curve on device (replacing its current effect)
+           - curve (callable, phase 0..1 => intensity 0..1)
+           - period (seconds per cycle)
+           - cycles (int or float, default None for forever)
+           - brightness (0..15, level at full intensity)
+           - finish (callable taking device, run when done)
+           - now (start time, default clock(); also prevents starting
+             the timer thread, for stepping by hand)
+        '''
+        start = self.clock() if now is None else now
+        with self.condition:
+            self.effects[id(device)] = Effect(device, curve, period, cycles, brightness, start, finish)
+            if now is None:
+                self.start()
+            self.condition.notify()
+        return self
+
+    def blink(self, device, rate=1, duration=None, now=None):
+        '''
+           Blink with the chip's hardware blinker (no steps at all)
+           - rate (1 = 2HZ, 2 = 1HZ, 3 = 0.5HZ)
+           - duration (seconds, default None to keep blinking)
+        '''
+        device.setDisplay(True, rate)
+        if duration is None:
+            self.cancel(device)
+            return self
+        return self.add(device, None, duration, 1,
+                        finish=lambda device: device.setDisplay(True, 0), now=now)
+
+    def breathe(self, device, period=4.0, cycles=None, brightness=15, now=None):
+        '''
+           Slowly dim & brighten, like a sleeping laptop
+           - period (seconds per breath)
+           - cycles (breaths, default None for forever)
+        '''
+        device.setDisplay(True, self._getBlinkRate(device))
+        return self.add(device, lambda phase: (1 - math.cos(2 * math.pi * phase)) / 2,
+                        period, cycles, brightness, now=now)
+
+    def cancel(self, device):
+        '''
+           Stop device's effect where it is
+        '''
+        with self.condition:
+            self.effects.pop(id(device), None)
+        return self
+
+    def fadeIn(self, device, duration=1.0, brightness=15, now=None):
+        '''
+           Turn the display on, and fade from dimmest to brightness
+           - duration (seconds)
+        '''
+        device.setBrightness(0).setDisplay(True, self._getBlinkRate(device))
+        return self.add(device, lambda phase: phase, duration, 1, brightness, now=now)
+
+    def fadeOut(self, device, duration=1.0, now=None):
+        '''
+           Fade from current brightness to dimmest, and turn the display off
+           - duration (seconds)
+        '''
+        brightness = device.getBrightness()
+        return self.add(device, lambda phase: 1 - phase, duration, 1,
+                        0x0F if brightness is None else brightness,
+                        lambda device: device.setDisplay(False, self._getBlinkRate(device)), now)
+
+    def pulse(self, device, period=1.0, cycles=None, brightness=15, now=None):
+        '''
+           Flash to full brightness, then decay; like a heart beat
+           - period (seconds per pulse)
+           - cycles (pulses, default None for forever)
+        '''
+        device.setDisplay(True, self._getBlinkRate(device))
+        return self.add(device, lambda phase: math.exp(-6 * phase), period, cycles, brightness, now=now)
+
+    def start(self):
+        '''
+           Start the timer thread (add() does so, as needed)
+        '''
+        with self.condition:
+            if self.thread is None or not self.thread.is_alive():
+                self.running = True
+                self.thread = threading.Thread(target=self.run, name="HT16K33-Effects")
+                self.thread.daemon = True
+                self.thread.start()
+        return self
+
+    def step(self, now=None):
+        '''
+           Set every device's level for time now; finished effects are
+           removed. Returns number of running effects.
+        '''
+        if now is None:
+            now = self.clock()
+        with self.condition:
+            effects = list(self.effects.items())
+        for key, effect in effects:
+            elapsed = now - effect.start
+            done = effect.cycles is not None and elapsed >= effect.period * effect.cycles
+            try:
+                if effect.curve is not None:
+                    if done:
+                        phase = effect.cycles % 1 or 1.0
+                    else:
+                        phase = (elapsed / effect.period) % 1
+                    intensity = min(max(effect.curve(phase), 0.0), 1.0)
+                    effect.device.setBrightness(int(round(effect.brightness * intensity ** self.GAMMA)))
+                if done and effect.finish is not None:
+                    effect.finish(effect.device)
+            except Exception as error:
+                self.error = error
+                done = True
+            if done:
+                with self.condition:
+                    if self.effects.get(key) is effect:
+                        del self.effects[key]
+        return len(self.effects)
+
+    def run(self):
+        '''
+           Timer loop; steps on a drift free schedule while there are
+           effects, and sleeps otherwise, until stop()
+        '''
+        period = 1.0 / self.fps
+        deadline = None
+        while self.running:
+            with self.condition:
+                while self.running and not self.effects:
+                    deadline = None
+                    self.condition.wait()
+                if not self.running:
+                    break
+                if deadline is None:
+                    deadline = self.clock()
+                delay = deadline - self.clock()
+                if delay > 0:
+                    # May be woken early by add() or stop(); check again
+                    self.condition.wait(delay)
+                    continue
+            now = self.clock()
+            self.step(now)
+            deadline += period
+            if deadline < now:
+                deadline = now + period
+        return self
+
+    def stop(self):
+        '''
+           Stop the timer thread (running effects stay where they are)
+        '''
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        return self
+
+    def wait(self, timeout=None):
+        '''
+           Block until every effect finished; returns False on timeout
+        '''
+        end = None if timeout is None else self.clock() + timeout
+        while self.effects:
+            if end is not None and self.clock() >= end:
+                return False
+            time.sleep(1.0 / self.fps)
+        return True
+
+    def _getBlinkRate(self, device):
+        display = device.getDisplay()
+        return 0 if display is None else display[1]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
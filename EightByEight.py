@@ -1,8 +1,18 @@
-from ._HT16K33 import Device
+from ._HT16K33 import Device, _packPlanes, _UNPACK
 
 
 __all__ = ['EightByEight']
 
+# bytes.translate() tables between COLUMN_VALUES order (column 0 => 0x80)
+# and plain order (column 0 => 0x01)
+_ROTATE_LEFT = bytes(bytearray(((value << 1) | (value >> 7)) & 0xFF for value in range(0x100)))
+_ROTATE_RIGHT = bytes(bytearray(((value >> 1) | (value << 7)) & 0xFF for value in range(0x100)))
+
+# _SPREAD[x][column] => all 8 rows (as a little endian 64-bit integer) of
+# a column byte (bit 0 is the top row) drawn at x, in COLUMN_VALUES order
+_SPREAD = tuple(tuple(sum(1 << (8 * y + (x - 1) % 8) for y in range(8) if column >> y & 1)
+                      for column in range(256)) for x in range(8))
+
 
 class EightByEight(Device):
     '''
@@ -39,18 +49,25 @@ class EightByEight(Device):
         '''
         x = int(x) % 8
         y = int(y) % 8
-        row_address = self.getRowAddressByIndex(y)
-        byte = self.bus.read_byte_data(self.address, row_address)
-        new_byte = self.COLUMN_VALUES[x]
-        if action == "or":
-            byte |= new_byte
-        elif action == "xor":
-            byte ^= new_byte
-        elif action == "andnot":
-            byte &= ~new_byte
-        else:
-            byte = new_byte
-        self.bus.write_byte_data(self.address, row_address, byte)
+        self.alterRAM(self.getRowAddressByIndex(y), self.COLUMN_VALUES[x], action)
+
+    def getFrame(self):
+        '''
+           Return current image as 8 rows of 8 booleans (from shadow RAM)
+
+           Example:
+           >>> matrix = EightByEight().setUp()
+           >>> matrix.setRow(1, [1, 0, 0, 0, 0, 0, 0, 1])
+           >>> matrix.getFrame()[1]
+           [True, False, False, False, False, False, False, True]
+        '''
+        frame = []
+        for row_address in self.ROW_ADDRESS:
+            value = self.buffer[row_address]
+            # Undo the rotated column order (column 0 => 0x80)
+            value = ((value << 1) | (value >> 7)) & 0xFF
+            frame.append([bool(bit) for bit in bytearray(_UNPACK[value])])
+        return frame
 
     def getRowAddressByIndex(self, row):
         '''
@@ -96,13 +113,95 @@ class EightByEight(Device):
         '''
         row_address = self.getRowAddressByIndex(row)
         value = 0
-        if isinstance(columns, list):
-            for index in columns:
-                if index:
+        if isinstance(columns, (list, tuple)):
+            for index, item in enumerate(columns[:8]):
+                if item:
                     value |= self.COLUMN_VALUES[index]
         elif isinstance(columns, int):
             value = columns % 0x100
-        self.bus.write_byte_data(self.address, row_address, value)
+        self.writeRAM(row_address, value)
+
+    def packColumns(self, columns):
+        '''
+           Convert 8 column bytes into a 16 byte display RAM image
+           - columns (8 bytes, left to right; bit 0 is the top row)
+
+           Each column is a single table lookup; there is no per-pixel
+           work, so scrolling a column strip through a memoryview costs
+           eight lookups per frame. Nothing is sent to the device.
+
+           Example:
+           >>> frame = EightByEight().packColumns(bytearray([0xFF, 0, 0, 0, 0, 0, 0, 0x01]))
+           >>> frame[0x00], frame[0x02]
+           (192, 128)
+        '''
+        spread = 0
+        for x, column in enumerate(bytearray(columns[:8])):
+            spread |= _SPREAD[x][column]
+        frame = bytearray(self.RAM_SIZE)
+        frame[0::2] = spread.to_bytes(8, "little")
+        return frame
+
+    def packFrame(self, pixels):
+        '''
+           Convert 8x8 pixels into a 16 byte display RAM image
+           - pixels (see setFrame)
+
+           Nothing is sent to the device.
+
+           Example:
+           >>> frame = EightByEight().packFrame([[1] + [0] * 7] * 8)
+           >>> frame[0x00], frame[0x0E]
+           (128, 128)
+           >>> EightByEight().packFrame([[256, 0.5, 0, 0, 0, 0, 0, 0]] * 8)[0x00]  # any non-zero pixel is lit
+           129
+        '''
+        frame = bytearray(self.RAM_SIZE)
+        for index, value in enumerate(_packPlanes(pixels)[0]):
+            # Rotate into COLUMN_VALUES order (column 0 => 0x80)
+            frame[self.ROW_ADDRESS[index]] = ((value >> 1) | (value << 7)) & 0xFF
+        return frame
+
+    def setFrame(self, pixels):
+        '''
+           Replace whole image, and send it with a single flush
+           - pixels (mixed)
+           -- 8x8 NumPy array (bool or uint8)
+           -- 8 item list of 8 item lists
+           -- 64 byte buffer-protocol object (row by row)
+
+           Any non-zero pixel is lit. Rows are packed eight pixels at a
+           time (or vectorized, for NumPy arrays), and rotated into the
+           COLUMN_VALUES bit order.
+
+           Example:
+           >>> matrix = EightByEight().setUp()
+           >>> matrix.setFrame([[x == y for x in range(8)] for y in range(8)])
+           >>> matrix.getFrame()[2]
+           [False, False, True, False, False, False, False, False]
+           >>> matrix.setFrame(bytes(bytearray([1] * 64)))
+        '''
+        self.writeFrame(self.packFrame(pixels))
+
+    def fromPlanes(self, planes):
+        '''
+           Join an 8x8 bit plane (64-bit integer; byte n is row n, bit m
+           is column m) into a display RAM image
+        '''
+        frame = bytearray(self.RAM_SIZE)
+        frame[0::2] = planes[0].to_bytes(8, "little").translate(_ROTATE_RIGHT)
+        return frame
+
+    def toPlanes(self, frame):
+        '''
+           Split a display RAM image into one 8x8 bit plane (see fromPlanes)
+
+           Example:
+           >>> matrix = EightByEight()
+           >>> hex(matrix.toPlanes(matrix.packFrame([[1] + [0] * 7] + [[0] * 8] * 7))[0])
+           '0x1'
+        '''
+        return [int.from_bytes(bytes(frame[0::2]).translate(_ROTATE_LEFT), "little")]
 
     def turnOnLED(self, x, y):
         '''
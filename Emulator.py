@@ -0,0 +1,166 @@
+import os
+import sys
+
+
+__all__ = ['Emulator']
+
+
+class Emulator(object):
+    '''
+       In-memory HT16K33 bus with the same interface as SMBus
+
+       Every (bus, address) pair gets its own 16 byte display RAM,
+       shared by all emulators opened on that bus number, like real
+       chips would be. Each emulator counts its own transactions, and
+       bytes sent or received after the address byte (register and
+       data.) Nothing is logged unless debug is enabled, or the
+       HT16K33_DEBUG environment variable is set.
+
+       Each chip also has key RAM (0x40..0x45) and the key interrupt
+       flag (0x60); press() & release() stand in for the buttons. The
+       flag is raised by a key press, and cleared by reading key RAM.
+
+       Example:
+       >>> bus = Emulator(7)
+       >>> bus.write_i2c_block_data(0x70, 0x00, [0x01, 0x02, 0x03])
+       >>> bus.read_byte_data(0x70, 0x01)
+       2
+       >>> bus.read_i2c_block_data(0x71, 0x00, 2)
+       [0, 0]
+       >>> bus.transactions, bus.bytes
+       (3, 9)
+       >>> bus.press(0x70, 17)
+       >>> bus.read_byte_data(0x70, 0x60), bus.read_i2c_block_data(0x70, 0x40, 6)
+       (255, [0, 0, 2, 0, 0, 0])
+       >>> bus.read_byte_data(0x70, 0x60)
+       0
+    '''
+
+    RAM_SIZE = 0x10
+    KEY_ADDRESS = 0x40
+    KEY_SIZE = 6
+    INTERRUPT_ADDRESS = 0x60
+
+    # Display RAM of every emulated chip, by (bus, address)
+    devices = {}
+    # Key RAM, and key interrupt flag, of every emulated chip
+    keys = {}
+    interrupts = {}
+
+    debug = bool(os.environ.get("HT16K33_DEBUG"))
+
+    def __init__(self, bus=0, debug=None, stream=None):
+        self.bus = bus
+        if debug is not None:
+            self.debug = debug
+        self.stream = stream or sys.stderr
+        self.transactions = 0
+        self.bytes = 0
+
+    def close(self):
+        pass
+
+    def getRAM(self, address):
+        '''
+           Return display RAM (bytearray) of the chip at address
+        '''
+        key = (self.bus, address)
+        if key not in self.devices:
+            self.devices[key] = bytearray(self.RAM_SIZE)
+        return self.devices[key]
+
+    def getKeys(self, address):
+        '''
+           Return key RAM (bytearray) of the chip at address
+        '''
+        key = (self.bus, address)
+        if key not in self.keys:
+            self.keys[key] = bytearray(self.KEY_SIZE)
+        return self.keys[key]
+
+    def press(self, address, key):
+        '''
+           Hold down key (0..47; 16 * K row + KS column) of the chip at
+           address, and raise its interrupt flag
+        '''
+        self.getKeys(address)[key // 8] |= 1 << (key % 8)
+        self.interrupts[(self.bus, address)] = True
+
+    def release(self, address, key):
+        '''
+           Let go of key of the chip at address
+        '''
+        self.getKeys(address)[key // 8] &= ~(1 << (key % 8)) & 0xFF
+
+    @classmethod
+    def reset(cls):
+        '''
+           Forget the display & key RAM of every emulated chip
+        '''
+        cls.devices.clear()
+        cls.keys.clear()
+        cls.interrupts.clear()
+
+    def resetCounters(self):
+        '''
+           Zero transaction & byte counters
+        '''
+        self.transactions = 0
+        self.bytes = 0
+        return self
+
+    def log(self, address, message, *args):
+        if self.debug:
+            self.stream.write("[%d:0x%0.2X] %s\n" % (self.bus, address, message % args))
+
+    def count(self, length):
+        self.transactions += 1
+        self.bytes += length
+
+    def write_byte(self, address, value):
+        self.count(1)
+        self.log(address, "Writing byte 0x%0.2X", value)
+
+    def write_byte_data(self, address, register, value):
+        self.count(2)
+        self.getRAM(address)[register % self.RAM_SIZE] = value & 0xFF
+        self.log(address, "Setting byte 0x%0.2X value 0x%0.2X [%s]", register, value, bin(value))
+
+    def read_byte_data(self, address, register):
+        self.count(2)
+        if register == self.INTERRUPT_ADDRESS:
+            value = 0xFF if self.interrupts.get((self.bus, address)) else 0x00
+        elif self.KEY_ADDRESS <= register < self.KEY_ADDRESS + self.KEY_SIZE:
+            value = self.getKeys(address)[register - self.KEY_ADDRESS]
+        else:
+            value = self.getRAM(address)[register % self.RAM_SIZE]
+        self.log(address, "Reading byte 0x%0.2X value 0x%0.2X [%s]", register, value, bin(value))
+        return value
+
+    def write_i2c_block_data(self, address, register, values):
+        self.count(1 + len(values))
+        ram = self.getRAM(address)
+        # RAM pointer auto-increments, and wraps, like the real chip
+        for offset, value in enumerate(values):
+            ram[(register + offset) % self.RAM_SIZE] = value & 0xFF
+        self.log(address, "Setting block 0x%0.2X values [%s]", register,
+                 " ".join("0x%0.2X" % value for value in values))
+
+    def read_i2c_block_data(self, address, register, length=32):
+        self.count(1 + length)
+        if self.KEY_ADDRESS <= register < self.KEY_ADDRESS + self.KEY_SIZE:
+            # Reading key RAM clears the interrupt flag
+            self.interrupts[(self.bus, address)] = False
+            ram = self.getKeys(address)
+            values = [ram[(register - self.KEY_ADDRESS + offset) % self.KEY_SIZE] for offset in range(length)]
+        else:
+            ram = self.getRAM(address)
+            values = [ram[(register + offset) % self.RAM_SIZE] for offset in range(length)]
+        self.log(address, "Reading block 0x%0.2X values [%s]", register,
+                 " ".join("0x%0.2X" % value for value in values))
+        return values
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from ._HT16K33 import Device
 
 
@@ -37,9 +39,51 @@ class FourDigit(Device):
     0x36 : 0x7d, # 6
     0x37 : 0x07, # 7
     0x38 : 0x7F, # 8
-    0x39 : 0x67  # 9
+    0x39 : 0x67, # 9
+    0x41 : 0x77, # A
+    0x42 : 0x7C, # B (as b)
+    0x43 : 0x39, # C
+    0x44 : 0x5E, # D (as d)
+    0x45 : 0x79, # E
+    0x46 : 0x71, # F
+    0x47 : 0x3D, # G
+    0x48 : 0x76, # H
+    0x49 : 0x30, # I
+    0x4A : 0x1E, # J
+    0x4C : 0x38, # L
+    0x4F : 0x3F, # O
+    0x50 : 0x73, # P
+    0x53 : 0x6D, # S
+    0x55 : 0x3E, # U
+    0x59 : 0x6E, # Y
+    0x61 : 0x77, # a (as A)
+    0x62 : 0x7C, # b
+    0x63 : 0x58, # c
+    0x64 : 0x5E, # d
+    0x65 : 0x79, # e (as E)
+    0x66 : 0x71, # f (as F)
+    0x68 : 0x74, # h
+    0x69 : 0x10, # i
+    0x6E : 0x54, # n
+    0x6F : 0x5C, # o
+    0x71 : 0x67, # q
+    0x72 : 0x50, # r
+    0x74 : 0x78, # t
+    0x75 : 0x1C, # u
+    0x79 : 0x6E, # y
+    0x20 : 0x00, # (space)
+    0x2D : 0x40, # -
+    0x3D : 0x48, # =
+    0x5F : 0x08, # _
+    0x27 : 0x20, # '
+    0x22 : 0x22  # "
   }
 
+  # Number of rendered strings kept by renderString(), per device; read
+  # when the device renders its first string
+  RENDER_CACHE_SIZE = 256
+  _renderCache = None
+
   def alterSingleLED(self, position=0, new_byte=0x00, action=None):
     '''
        Manipulate single LED in character position
@@ -52,18 +96,7 @@ class FourDigit(Device):
        >>> digit.setDigit(0, 0x5B)            # Assign "2" character to first digit
        >>> digit.alterSingleLED(0, 0x80,"or") # Alter first digit to include period
     '''
-    position=int(position) % 4
-    digit_address = self.getDigitAddressAtPosition(position)
-    byte = self.bus.read_byte_data(self.address, digit_address)
-    if action == "or":
-        byte |= new_byte
-    elif action == "xor":
-        byte ^= new_byte
-    elif action == "andnot":
-        byte &= ~new_byte
-    else:
-        byte = new_byte
-    self.bus.write_byte_data(self.address, digit_address, byte)
+    self.alterRAM(self.getDigitAddressAtPosition(position), new_byte, action)
 
   def getDigitAddressAtPosition(self, position=0):
     '''
@@ -102,9 +135,34 @@ class FourDigit(Device):
       pass
     return integer
 
+  def packFrame(self, characters=""):
+    '''
+       Convert up to four digits into a 16 byte display RAM image
+       - characters (mixed)
+       -- String of characters (see renderString)
+       -- List of raw LED values, one per position
+
+       Nothing is sent to the device.
+
+       Example:
+       >>> frame = FourDigit().packFrame("12:34")
+       >>> frame[0x00], frame[0x04], frame[0x08]
+       (6, 255, 102)
+       >>> FourDigit().packFrame([0x01, 0x01, 0x01, 0x01])[0x06]
+       1
+    '''
+    frame = bytearray(self.RAM_SIZE)
+    if isinstance(characters, str):
+      image = self.renderString(characters)
+      characters = image[:len(self.DIGIT_ADDRESS)]
+      frame[self.COLON_ADDRESS] = image[-1]
+    for position, value in enumerate(characters[:len(self.DIGIT_ADDRESS)]):
+      frame[self.DIGIT_ADDRESS[position]] = int(value) % 0x100
+    return frame
+
   def readAtPosition(self, position=0):
     '''
-       Return LED value currently in devices EEPROM
+       Return LED value currently in devices RAM (from shadow copy)
        - position (0..3)
 
        Example:
@@ -113,7 +171,68 @@ class FourDigit(Device):
        >>> digit.readAtPosition(0)
        255
     '''
-    return self.bus.read_byte_data(self.address, self.getDigitAddressAtPosition(position))
+    return self.readRAM(self.getDigitAddressAtPosition(position))
+
+  def encodeGlyphs(self, characters):
+    '''
+       Generate one LED value per digit from characters
+       - characters (any iterable of characters, read lazily; see
+         CHARACTER_MAP, "." lights previous digit's period)
+
+       Example:
+       >>> list(FourDigit().encodeGlyphs(iter("1..2")))
+       [134, 128, 91]
+    '''
+    pending = None
+    for character in characters:
+      if character == "." and pending is not None and not pending & self.PERIOD:
+        pending |= self.PERIOD
+        continue
+      if pending is not None:
+        yield pending
+      pending = self.PERIOD if character == "." else self.CHARACTER_MAP.get(ord(character), 0x00)
+    if pending is not None:
+      yield pending
+
+  def encodeString(self, text, right=False):
+    '''
+       Encode text into a packed 5 byte image, without caching (see
+       renderString)
+    '''
+    digits = len(self.DIGIT_ADDRESS)
+    glyphs = list(self.encodeGlyphs(character for character in text if character != ":"))
+    colon = 0xFF if ":" in text else 0x00
+    if len(glyphs) > digits:
+      raise ValueError("%r does not fit in %d digits" % (text, digits))
+    padding = [0x00] * (digits - len(glyphs))
+    glyphs = padding + glyphs if right else glyphs + padding
+    return bytes(bytearray(glyphs + [colon]))
+
+  def renderString(self, text, right=False):
+    '''
+       Encode text into a packed 5 byte image; 4 digits, then colon
+       - text (see CHARACTER_MAP; "." lights previous digit's period,
+         ":" lights the colon)
+       - right (Boolean, default False) align text to the right
+
+       Results are kept in a LRU cache of RENDER_CACHE_SIZE strings per
+       device; so, a repeating display is only encoded once, with the
+       device's own CHARACTER_MAP.
+
+       Example:
+       >>> digit = FourDigit()
+       >>> list(bytearray(digit.renderString("12:3.4")))
+       [6, 91, 207, 102, 255]
+       >>> list(bytearray(digit.renderString("-1", True)))
+       [0, 0, 64, 6, 0]
+       >>> digit = FourDigit()
+       >>> digit.CHARACTER_MAP = {ord("1"): 0x30}  # "1" on the left segments
+       >>> list(bytearray(digit.renderString("1")))
+       [48, 0, 0, 0, 0]
+    '''
+    if self._renderCache is None:
+      self._renderCache = lru_cache(maxsize=self.RENDER_CACHE_SIZE)(self.encodeString)
+    return self._renderCache(text, right)
 
   def setDigit(self, position=0, value=0x00):
     '''
@@ -128,7 +247,7 @@ class FourDigit(Device):
        >>> digit.setDigit(2, 0x4F) # 3
        >>> digit.setDigit(3, 0x66) # 4
     '''
-    self.bus.write_byte_data(self.address, self.getDigitAddressAtPosition(position), int(value) % 0x100)
+    self.writeRAM(self.getDigitAddressAtPosition(position), value)
 
   def turnOnColon(self):
     '''
@@ -138,7 +257,7 @@ class FourDigit(Device):
        >>> digit = FourDigit().setUp()
        >>> digit.turnOnColon()
     '''
-    self.bus.write_byte_data(self.address, self.COLON_ADDRESS, 0xFF)
+    self.writeRAM(self.COLON_ADDRESS, 0xFF)
 
   def turnOffColon(self):
     '''
@@ -148,7 +267,7 @@ class FourDigit(Device):
        >>> digit = FourDigit().setUp()
        >>> digit.turnOffColon()
     '''
-    self.bus.write_byte_data(self.address, self.COLON_ADDRESS, 0x00)
+    self.writeRAM(self.COLON_ADDRESS, 0x00)
 
   def turnOnPeriodAtPosition(self, position=0):
     '''
@@ -162,6 +281,79 @@ class FourDigit(Device):
     '''
     self.alterSingleLED(position, self.PERIOD,"andnot")
 
+  def writeImage(self, image):
+    '''
+       Write packed image, 4 digit values then colon, in a single flush
+       - image (5 bytes, see renderString)
+
+       Example:
+       >>> digit = FourDigit().setUp()
+       >>> digit.writeImage(b"\\x01\\x02\\x04\\x08\\x00")
+       >>> digit.readAtPosition(3)
+       8
+    '''
+    frame = bytearray(self.buffer)
+    for position, address in enumerate(self.DIGIT_ADDRESS):
+      frame[address] = image[position]
+    frame[self.COLON_ADDRESS] = image[len(self.DIGIT_ADDRESS)]
+    self.writeFrame(frame)
+
+  def writeNumber(self, value, decimals=None, base=10):
+    '''
+       Write number, aligned to the right, in a single flush
+       - value (int or float)
+       - decimals (int, default None) digits after the period; None
+         shows as many as fit
+       - base (10 or 16)
+
+       Example:
+       >>> digit = FourDigit().setUp()
+       >>> digit.writeNumber(3.14159)    # "3.142"
+       >>> digit.readAtPosition(0)
+       207
+       >>> digit.writeNumber(9.9999)     # "10.00"
+       >>> digit.writeNumber(99.999)     # "100.0"
+       >>> digit.readAtPosition(2)
+       191
+       >>> digit.writeNumber(-42)
+       >>> digit.writeNumber(0xBEEF, base=16)
+       >>> digit.writeNumber(12.5, decimals=2)
+    '''
+    digits = len(self.DIGIT_ADDRESS)
+    if base == 16:
+      text = "%X" % int(value) if value >= 0 else "-%X" % -int(value)
+    elif isinstance(value, float) or decimals:
+      fit = decimals is None
+      if fit:
+        decimals = max(0, digits - len("%d" % abs(int(value))) - (value < 0))
+      text = "%.*f" % (decimals, value)
+      # Rounding may add an integer digit (9.9999 is "10.000"); drop a decimal
+      while fit and decimals and len(text) - 1 > digits:
+        decimals -= 1
+        text = "%.*f" % (decimals, value)
+    else:
+      text = "%d" % value
+    self.writeString(text, True)
+
+  def writeString(self, text, right=False):
+    '''
+       Write text across all digits & colon in a single flush
+       - text (see renderString)
+       - right (Boolean, default False) align text to the right
+
+       Every digit register, and the colon, is rewritten; unused
+       digits are blanked. Registers 0x00..0x08 go out as (at most) one
+       block write.
+
+       Example:
+       >>> digit = FourDigit().setUp()
+       >>> digit.writeString("12:3.4")
+       >>> digit.readAtPosition(2), digit.readRAM(digit.COLON_ADDRESS)
+       (207, 255)
+       >>> digit.writeString("Err")
+    '''
+    self.writeImage(self.renderString(text, right))
+
   def writeDigit(self, position, char=None):
     '''
        Write single character to a given position
@@ -0,0 +1,109 @@
+from ._HT16K33 import Device, _changedMask
+
+
+__all__ = ['Diff', 'DiffEncoder']
+
+
+class Diff(object):
+    '''
+       Precomputed register updates between two display RAM images
+
+       - mask (bit mask of changed registers)
+       - writes (tuple of (start register, bytes) transactions)
+
+       Stats:
+       - changed (registers whose value changed)
+       - transactions (bus transactions sent by Device.writeDiff)
+       - length (bytes sent, register bytes included)
+       - saved (transactions saved over one write per changed register)
+    '''
+
+    __slots__ = ('mask', 'writes', 'changed', 'transactions', 'length', 'saved')
+
+    def __init__(self, mask, writes):
+        self.mask = mask
+        self.writes = writes
+        self.changed = bin(mask).count("1")
+        self.transactions = len(writes)
+        self.length = sum(len(data) + 1 for start, data in writes)
+        self.saved = self.changed - self.transactions
+
+    def __repr__(self):
+        return "<Diff changed=%d transactions=%d length=%d>" % (self.changed, self.transactions, self.length)
+
+    def apply(self, frame):
+        '''
+           Update a bytearray frame in place (no bus traffic)
+        '''
+        for start, data in self.writes:
+            frame[start:start + len(data)] = data
+        return frame
+
+
+class DiffEncoder(object):
+    '''
+       Turn consecutive frames into minimal register updates
+
+       Each new frame is XORed against the last committed one; changed
+       registers become a bit mask, grouped into transactions by
+       Device.getFlushPlan(). Plans are cached by mask, so a recurring
+       change pattern is planned only once. Resulting Diffs are
+       replayed with Device.writeDiff().
+
+       - previous (bytes-like, default blank display)
+       - planner (Device class or instance whose costs plan writes)
+
+       Example:
+       >>> encoder = DiffEncoder()
+       >>> diff = encoder.encode(b"\\xff" + b"\\x00" * 14 + b"\\x80")
+       >>> diff.writes, diff.saved
+       (((0, b'\\xff'), (15, b'\\x80')), 0)
+       >>> diff = encoder.encode(b"\\x00\\x01\\x00\\x01\\x01" + b"\\x00" * 10 + b"\\x80")
+       >>> diff.writes, diff.changed, diff.saved
+       (((0, b'\\x00\\x01\\x00\\x01\\x01'),), 4, 3)
+       >>> encoder.frames, encoder.changed, encoder.transactions
+       (2, 6, 3)
+    '''
+
+    def __init__(self, previous=None, planner=Device):
+        self.previous = bytearray(Device.RAM_SIZE)
+        if previous is not None:
+            self.previous[:len(previous)] = bytearray(previous)
+        self.planner = planner
+        self.plans = {}
+        self.reset()
+
+    def encode(self, frame):
+        '''
+           Return the Diff from the last committed frame to frame, and
+           commit frame
+           - frame (bytes-like, up to 16 bytes)
+        '''
+        frame = bytearray(frame)
+        if len(frame) > Device.RAM_SIZE:
+            raise ValueError("Frame larger than %d bytes" % Device.RAM_SIZE)
+        previous = self.previous
+        frame += previous[len(frame):]
+        mask = _changedMask(previous, frame)
+        plan = self.plans.get(mask)
+        if plan is None:
+            plan = self.plans[mask] = Device.getFlushPlan(self.planner, mask)
+        diff = Diff(mask, tuple((start, bytes(frame[start:start + length])) for start, length in plan))
+        self.previous = frame
+        self.frames += 1
+        self.changed += diff.changed
+        self.transactions += diff.transactions
+        self.length += diff.length
+        return diff
+
+    def reset(self):
+        '''
+           Zero the totals (frames, changed, transactions & length)
+        '''
+        self.frames = self.changed = self.transactions = self.length = 0
+        return self
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
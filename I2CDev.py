@@ -0,0 +1,83 @@
+import os
+
+
+__all__ = ['I2CDev']
+
+
+class I2CDev(object):
+    '''
+       Raw /dev/i2c-N bus backend
+
+       Selects the slave address with the I2C_SLAVE ioctl (only when it
+       changes), then sends each transaction as a single os.write() of
+       register + payload; so, a 16 byte frame costs one system call
+       and no per-byte Python/C round trips. Same interface as SMBus.
+
+       - bus (bus number, opens /dev/i2c-<bus>)
+       - fd (already opened file descriptor, used instead of bus)
+       - ioctl (callable, default fcntl.ioctl)
+
+       Example:
+       >>> import socket
+       >>> chip, host = socket.socketpair()
+       >>> calls = []
+       >>> bus = I2CDev(fd=host.fileno(), ioctl=lambda *args: calls.append(args))
+       >>> bus.write_i2c_block_data(0x70, 0x00, [0xFF, 0x81])
+       >>> bus.write_byte_data(0x70, 0x04, 0x01)
+       >>> chip.recv(16)
+       b'\\x00\\xff\\x81\\x04\\x01'
+       >>> len(calls)
+       1
+    '''
+
+    I2C_SLAVE = 0x0703
+
+    def __init__(self, bus=0, fd=None, ioctl=None):
+        self.bus = bus
+        if fd is None:
+            fd = os.open("/dev/i2c-%d" % bus, os.O_RDWR)
+        if ioctl is None:
+            from fcntl import ioctl
+        self.fd = fd
+        self.ioctl = ioctl
+        self.address = None
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def select(self, address):
+        '''
+           Point file descriptor at slave address
+        '''
+        if address != self.address:
+            self.ioctl(self.fd, self.I2C_SLAVE, address)
+            self.address = address
+
+    def write(self, address, data):
+        self.select(address)
+        os.write(self.fd, data)
+
+    def write_byte(self, address, value):
+        self.write(address, bytes(bytearray((value,))))
+
+    def write_byte_data(self, address, register, value):
+        self.write(address, bytes(bytearray((register, value))))
+
+    def write_i2c_block_data(self, address, register, values):
+        data = bytearray((register,))
+        data.extend(values)
+        self.write(address, bytes(data))
+
+    def read_byte_data(self, address, register):
+        return self.read_i2c_block_data(address, register, 1)[0]
+
+    def read_i2c_block_data(self, address, register, length=32):
+        self.write(address, bytes(bytearray((register,))))
+        return list(bytearray(os.read(self.fd, length)))
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
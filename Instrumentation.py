@@ -0,0 +1,212 @@
+import time
+
+
+__all__ = ['Histogram', 'Instrumentation']
+
+
+class Histogram(object):
+    '''
+       HDR-style histogram of positive integers (i.e. microseconds)
+
+       Values below SUB_BUCKETS are counted exactly; above, every power
+       of two is split into SUB_BUCKETS / 2 linear buckets; so, the
+       relative error stays under 2 / SUB_BUCKETS over any range with
+       a handful of counters.
+
+       Example:
+       >>> histogram = Histogram()
+       >>> for value in range(1, 1001):
+       ...   histogram.record(value)
+       ...
+       >>> histogram.count, histogram.min, histogram.max
+       (1000, 1, 1000)
+       >>> histogram.percentile(50)
+       496
+    '''
+
+    SUB_BUCKETS = 32
+
+    def __init__(self):
+        self.shift = self.SUB_BUCKETS.bit_length() - 1
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        return self
+
+    def getIndex(self, value):
+        '''
+           Return bucket index holding value
+        '''
+        if value < self.SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - self.shift
+        half = self.SUB_BUCKETS >> 1
+        return self.SUB_BUCKETS + (exponent - 1) * half + (value >> exponent) - half
+
+    def getLowerBound(self, index):
+        '''
+           Return smallest value of bucket index
+        '''
+        if index < self.SUB_BUCKETS:
+            return index
+        half = self.SUB_BUCKETS >> 1
+        exponent, offset = divmod(index - self.SUB_BUCKETS, half)
+        return (half + offset) << (exponent + 1)
+
+    def percentile(self, percent):
+        '''
+           Return lower bound of bucket holding the given percentile
+           - percent (0..100)
+        '''
+        if not self.count:
+            return 0
+        target = max(1, int(round(self.count * percent / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return self.getLowerBound(index)
+        return self.max
+
+    def record(self, value):
+        '''
+           Count value (int >= 0)
+        '''
+        value = int(value)
+        index = self.getIndex(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        '''
+           Return histogram summary, and non-empty buckets, as a dict
+        '''
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / float(self.count) if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "buckets": [(self.getLowerBound(index), self.counts[index]) for index in sorted(self.counts)],
+        }
+
+
+class Instrumentation(object):
+    '''
+       Transaction counters, latency histogram & callbacks of a device
+
+       Enabled with Device.instrument(); it then stands in for the
+       device's shared bus, and times each write_byte, write_byte_data,
+       read_byte_data & block transfer. Disabling puts the plain bus
+       back; so, a device pays nothing when not instrumented.
+
+       Callbacks registered in before are called with (device,
+       operation, register, payload); those in after with (device,
+       operation, register, payload, seconds, error.) Register is None
+       for command bytes; payload is the list of bytes written, or read.
+
+       Example:
+       >>> from HT16K33 import EightByEight
+       >>> matrix = EightByEight(backend="emulator").instrument()
+       >>> operations = []
+       >>> matrix.instrumentation.after.append(lambda *call: operations.append(call[1]))
+       >>> matrix = matrix.setUp()
+       >>> matrix.setRow(0, 0xFF)
+       >>> operations
+       ['write_i2c_block_data', 'write_byte', 'write_byte', 'write_byte', 'write_byte_data']
+       >>> snapshot = matrix.instrumentation.snapshot()
+       >>> snapshot["transactions"], snapshot["bytes"], snapshot["errors"]
+       (5, 22, 0)
+    '''
+
+    def __init__(self, device):
+        self.device = device
+        self.bus = None
+        self.before = []
+        self.after = []
+        self.reset()
+
+    def __getattr__(self, name):
+        # Everything else (lock, close, handle...) is the shared bus's
+        return getattr(self.bus, name)
+
+    def reset(self):
+        '''
+           Zero counters & histogram
+        '''
+        self.transactions = 0
+        self.bytes = 0
+        self.errors = 0
+        self.latency = Histogram()
+        return self
+
+    def snapshot(self):
+        '''
+           Return counters & latency (microseconds) as a dict
+        '''
+        return {
+            "bus": self.device.busNumber,
+            "address": self.device.address,
+            "transactions": self.transactions,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "latency_us": self.latency.snapshot(),
+        }
+
+    def call(self, operation, register, payload, function, *args):
+        for callback in self.before:
+            callback(self.device, operation, register, payload)
+        error = None
+        start = time.perf_counter()
+        try:
+            result = function(*args)
+        except Exception as exception:
+            error = exception
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.transactions += 1
+            self.latency.record(elapsed * 1e6)
+            if error is None and payload is None:
+                payload = result if isinstance(result, list) else [result]
+            if payload is not None:
+                self.bytes += len(payload) + (register is not None)
+            for callback in self.after:
+                callback(self.device, operation, register, payload, elapsed, error)
+        return result
+
+    def write_byte(self, address, value):
+        return self.call("write_byte", None, [value], self.bus.write_byte, address, value)
+
+    def write_byte_data(self, address, register, value):
+        return self.call("write_byte_data", register, [value], self.bus.write_byte_data, address, register, value)
+
+    def read_byte_data(self, address, register):
+        return self.call("read_byte_data", register, None, self.bus.read_byte_data, address, register)
+
+    def write_i2c_block_data(self, address, register, values):
+        return self.call("write_i2c_block_data", register, list(values),
+                         self.bus.write_i2c_block_data, address, register, values)
+
+    def read_i2c_block_data(self, address, register, length=32):
+        return self.call("read_i2c_block_data", register, None,
+                         self.bus.read_i2c_block_data, address, register, length)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,167 @@
+from collections import namedtuple
+import time
+
+
+__all__ = ['KeyEvent', 'KeyScanner']
+
+KeyEvent = namedtuple("KeyEvent", "time device key pressed")
+
+
+class KeyScanner(object):
+    '''
+       Scan the key matrix of one or more HT16K33 chips
+
+       While no key is held, a device costs a single byte read per scan
+       (the interrupt flag); only once a key press is flagged, or while
+       keys are held, is key RAM read, with one 6 byte block read. A
+       change is accepted once the same keys were read on debounce
+       consecutive scans. Scans run on a drift free schedule at rate;
+       so, CPU use stays bounded whatever the number of devices.
+
+       - devices (list of Device, i.e. addresses 0x70..0x77)
+       - rate (scans per second, default 100)
+       - debounce (consecutive scans, default 2)
+
+       Example:
+       >>> from HT16K33._HT16K33 import Device
+       >>> panel = Device(backend="emulator", address=0x76)
+       >>> scanner = KeyScanner([panel])
+       >>> panel.bus.handle.press(0x76, 3)
+       >>> scanner.scan(0.00), scanner.scan(0.01)  # doctest: +ELLIPSIS
+       ([], [KeyEvent(time=0.01, device=..., key=3, pressed=True)])
+       >>> panel.bus.handle.release(0x76, 3)
+       >>> scanner.scan(0.02), scanner.scan(0.03)  # doctest: +ELLIPSIS
+       ([], [KeyEvent(time=0.03, device=..., key=3, pressed=False)])
+       >>> scanner.getKeys(panel)
+       0
+    '''
+
+    def __init__(self, devices, rate=100, debounce=2, clock=time.monotonic, sleep=time.sleep):
+        self.devices = list(devices)
+        self.rate = float(rate)
+        self.debounce = max(int(debounce), 1)
+        self.clock = clock
+        self.sleep = sleep
+        self.running = False
+        # Per device: [debounced keys, last keys read, scans read the same]
+        self.states = [[0, 0, 0] for device in self.devices]
+
+    def events(self):
+        '''
+           Generate KeyEvents, scanning at rate, until stop()
+
+           Example:
+           >>> from HT16K33._HT16K33 import Device
+           >>> panel = Device(backend="emulator", address=0x75)
+           >>> panel.bus.handle.press(0x75, 40)
+           >>> scanner = KeyScanner([panel], rate=1000)
+           >>> for event in scanner.events():
+           ...   print(event.key, event.pressed)
+           ...   scanner = scanner.stop()
+           ...
+           40 True
+        '''
+        period = 1.0 / self.rate
+        self.running = True
+        deadline = self.clock()
+        while self.running:
+            delay = deadline - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            now = self.clock()
+            for event in self.scan(now):
+                yield event
+            deadline += period
+            # Skip missed scans, rather than catching up in a burst
+            if deadline < now:
+                deadline = now + period
+
+    def getKeys(self, device):
+        '''
+           Return debounced keys held down on device (bit mask)
+        '''
+        return self.states[self.devices.index(device)][0]
+
+    def scan(self, now=None):
+        '''
+           Scan every device once; return list of KeyEvents
+        '''
+        if now is None:
+            now = self.clock()
+        events = []
+        for index in range(len(self.devices)):
+            events.extend(self.scanDevice(index, now))
+        return events
+
+    def scanDevice(self, index, now):
+        '''
+           Scan devices[index] once; return list of KeyEvents
+        '''
+        device = self.devices[index]
+        state = self.states[index]
+        stable, last, count = state
+        if not stable and not last and not device.readInterrupt():
+            return []
+        keys = device.readKeys()
+        count = count + 1 if keys == last else 1
+        state[1:] = keys, count
+        if count < self.debounce or keys == stable:
+            return []
+        state[0] = keys
+        events = []
+        changed = keys ^ stable
+        while changed:
+            bit = changed & -changed
+            events.append(KeyEvent(now, device, bit.bit_length() - 1, bool(keys & bit)))
+            changed ^= bit
+        return events
+
+    def stop(self):
+        '''
+           Stop events() & stream() before the next scan
+        '''
+        self.running = False
+        return self
+
+    async def stream(self):
+        '''
+           Async generator of KeyEvents, scanning at rate, until stop()
+
+           Devices on different buses are scanned concurrently, on their
+           bus executors (see Device.getExecutor); so, the event loop
+           never blocks on i2c.
+        '''
+        import asyncio
+        loop = asyncio.get_running_loop()
+        buses = {}
+        for index, device in enumerate(self.devices):
+            buses.setdefault(device.busNumber, []).append(index)
+
+        def scanBus(indexes, now):
+            events = []
+            for index in indexes:
+                events.extend(self.scanDevice(index, now))
+            return events
+
+        period = 1.0 / self.rate
+        self.running = True
+        deadline = loop.time()
+        while self.running:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = self.clock()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(self.devices[indexes[0]].getExecutor(), scanBus, indexes, now)
+                for indexes in buses.values()])
+            for events in results:
+                for event in events:
+                    yield event
+            deadline += period
+            if deadline < loop.time():
+                deadline = loop.time() + period
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,95 @@
+from collections import deque
+import time
+
+
+__all__ = ['Marquee']
+
+
+class Marquee(object):
+    '''
+       Scroll text across a FourDigit display, one character per tick
+
+       Text comes from a string, or any iterator of strings (i.e. a
+       generator reading a log); characters are encoded into glyphs
+       only as they are needed, and a 4 glyph sliding window is all
+       that is kept; so, memory stays the same for any message length.
+       Each step is a single writeImage() flush.
+
+       - digit (FourDigit)
+       - source (str, or iterable of str)
+       - speed (characters per second, default 4)
+       - pause (seconds to hold the end of the message, default 1.0)
+
+       Example:
+       >>> from HT16K33 import FourDigit
+       >>> digit = FourDigit().setUp()
+       >>> [bytes(step) for step in Marquee(digit, iter(["1.", "2"])).steps()]
+       [b'\\x00\\x00\\x00\\x86', b'\\x00\\x00\\x86[', b'\\x00\\x86[\\x00', b'\\x86[\\x00\\x00', b'[\\x00\\x00\\x00', b'\\x00\\x00\\x00\\x00']
+    '''
+
+    def __init__(self, digit, source, speed=4, pause=1.0):
+        self.digit = digit
+        self.source = source
+        self.speed = float(speed)
+        self.pause = pause
+        self.running = False
+
+    def glyphs(self):
+        '''
+           Lazily encode source into glyphs (see FourDigit.encodeGlyphs)
+        '''
+        source = [self.source] if isinstance(self.source, str) else self.source
+        return self.digit.encodeGlyphs(character for text in source for character in text)
+
+    def steps(self):
+        '''
+           Iterate display windows (4 glyphs); text enters on the right,
+           and scrolls off to the left. self.end is True for the first
+           step after the whole message has entered.
+        '''
+        digits = len(self.digit.DIGIT_ADDRESS)
+        window = deque([0x00] * digits, maxlen=digits)
+        self.end = False
+        for glyph in self.glyphs():
+            window.append(glyph)
+            yield window
+        self.end = True
+        for blank in range(digits):
+            window.append(0x00)
+            yield window
+            self.end = False
+
+    def run(self, clock=time.monotonic, sleep=time.sleep):
+        '''
+           Scroll the whole message once, on a drift free schedule
+        '''
+        period = 1.0 / self.speed
+        colon = bytearray((0x00,))
+        self.running = True
+        deadline = clock()
+        for window in self.steps():
+            if not self.running:
+                break
+            if self.end:
+                deadline += self.pause
+            delay = deadline - clock()
+            if delay > 0:
+                sleep(delay)
+            else:
+                deadline = clock()
+            self.digit.writeImage(bytearray(window) + colon)
+            deadline += period
+        self.running = False
+        return self
+
+    def stop(self):
+        '''
+           Stop run() before the next step (i.e. from another thread)
+        '''
+        self.running = False
+        return self
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
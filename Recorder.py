@@ -0,0 +1,181 @@
+from collections import deque, namedtuple
+import struct
+import time
+
+
+__all__ = ['Recorder', 'Transaction']
+
+Transaction = namedtuple("Transaction", "time bus address operation register payload")
+
+
+class Recorder(object):
+    '''
+       Capture every bus transaction of one or more devices
+
+       Records are packed as: start time (float64 seconds since the
+       recorder was created), bus, address, operation, register &
+       payload length (one byte each), then the payload. A capture is
+       MAGIC followed by records. Without a stream, records are kept in
+       a ring buffer holding at most size bytes (oldest dropped first.)
+
+       - stream (writable binary file, default None for ring buffer)
+       - size (ring buffer bytes, default 64KiB)
+
+       Example:
+       >>> from HT16K33 import FourDigit
+       >>> digit = FourDigit(backend="emulator")
+       >>> recorder = Recorder().attach(digit)
+       >>> digit = digit.setUp()
+       >>> digit.writeDigit(0, 7)
+       >>> [(call.operation, call.register, call.payload) for call in Recorder.load(recorder.getvalue())][-2:]
+       [('write_byte', None, [231]), ('write_byte_data', 0, [7])]
+       >>> Recorder.replay(recorder.getvalue(), backend="emulator", speed=None)["transactions"]
+       5
+    '''
+
+    MAGIC = b"HT16K33R"
+    RECORD = struct.Struct("<dBBBBB")
+    OPERATIONS = ("write_byte", "write_byte_data", "read_byte_data",
+                  "write_i2c_block_data", "read_i2c_block_data")
+    # Register byte value stored for command bytes (write_byte)
+    NO_REGISTER = 0xFF
+
+    def __init__(self, stream=None, size=1 << 16):
+        self.stream = stream
+        self.size = size
+        self.records = deque()
+        self.length = 0
+        self.start = time.perf_counter()
+        if stream is not None:
+            stream.write(self.MAGIC)
+
+    def attach(self, device):
+        '''
+           Start recording device's transactions (enables instrumentation)
+        '''
+        device.instrument()
+        device.instrumentation.after.append(self.record)
+        return self
+
+    def detach(self, device):
+        '''
+           Stop recording device's transactions
+        '''
+        if device.instrumentation is not None and self.record in device.instrumentation.after:
+            device.instrumentation.after.remove(self.record)
+        return self
+
+    def getvalue(self):
+        '''
+           Return ring buffer contents as a capture (bytes)
+        '''
+        return self.MAGIC + b"".join(self.records)
+
+    def record(self, device, operation, register, payload, seconds, error=None):
+        '''
+           Instrumentation callback; pack one transaction
+        '''
+        if error is not None:
+            return
+        payload = bytearray(payload)
+        data = self.RECORD.pack(time.perf_counter() - seconds - self.start,
+                                device.busNumber, device.address,
+                                self.OPERATIONS.index(operation),
+                                self.NO_REGISTER if register is None else register,
+                                len(payload)) + bytes(payload)
+        if self.stream is not None:
+            self.stream.write(data)
+            return
+        self.records.append(data)
+        self.length += len(data)
+        while self.length > self.size:
+            self.length -= len(self.records.popleft())
+
+    def save(self, path):
+        '''
+           Write ring buffer contents to a capture file
+        '''
+        with open(path, "wb") as stream:
+            stream.write(self.getvalue())
+        return self
+
+    @classmethod
+    def load(cls, capture):
+        '''
+           Iterate Transaction tuples of a capture
+           - capture (bytes-like, or readable binary file)
+        '''
+        if hasattr(capture, "read"):
+            capture = capture.read()
+        view = memoryview(capture)
+        if view[:len(cls.MAGIC)].tobytes() != cls.MAGIC:
+            raise ValueError("Not a HT16K33 bus capture")
+        offset = len(cls.MAGIC)
+        while offset < len(view):
+            timestamp, bus, address, operation, register, length = cls.RECORD.unpack_from(view, offset)
+            offset += cls.RECORD.size
+            payload = list(bytearray(view[offset:offset + length]))
+            offset += length
+            operation = cls.OPERATIONS[operation]
+            yield Transaction(timestamp, bus, address, operation,
+                              None if operation == "write_byte" else register, payload)
+
+    @classmethod
+    def replay(cls, capture, backend=None, speed=1.0, sleep=time.sleep):
+        '''
+           Re-execute a capture against any backend
+           - capture (bytes-like, or readable binary file)
+           - backend (see Device.BACKENDS)
+           - speed (float, default 1.0 original timing; None as fast as possible)
+
+           Timing starts at the first record; so, only the gaps between
+           transactions are kept (i.e. of a ring buffer capture taken
+           long after the recorder was created.)
+           Returns transactions, bytes & elapsed seconds as a dict.
+
+           Example:
+           >>> capture = Recorder.MAGIC + b"".join(Recorder.RECORD.pack(seconds, 0, 0x70, 0, 0xFF, 1) + b"\\x81"
+           ...                                     for seconds in (3600.0, 3600.5))
+           >>> delays = []
+           >>> Recorder.replay(capture, backend="emulator", sleep=delays.append)["transactions"]
+           2
+           >>> [round(delay, 1) for delay in delays]
+           [0.5]
+        '''
+        from ._HT16K33 import SharedBus
+        buses = {}
+        transactions = length = 0
+        start = time.perf_counter()
+        base = None
+        try:
+            for call in cls.load(capture):
+                if speed:
+                    if base is None:
+                        base = start - call.time / speed
+                    delay = base + call.time / speed - time.perf_counter()
+                    if delay > 0:
+                        sleep(delay)
+                if call.bus not in buses:
+                    buses[call.bus] = SharedBus.open(call.bus, backend)
+                bus = buses[call.bus]
+                if call.operation == "write_byte":
+                    bus.write_byte(call.address, call.payload[0])
+                elif call.operation == "write_byte_data":
+                    bus.write_byte_data(call.address, call.register, call.payload[0])
+                elif call.operation == "read_byte_data":
+                    bus.read_byte_data(call.address, call.register)
+                elif call.operation == "write_i2c_block_data":
+                    bus.write_i2c_block_data(call.address, call.register, call.payload)
+                else:
+                    bus.read_i2c_block_data(call.address, call.register, len(call.payload))
+                transactions += 1
+                length += len(call.payload) + (call.register is not None)
+        finally:
+            for bus in buses.values():
+                bus.close()
+        return {"transactions": transactions, "bytes": length, "elapsed": time.perf_counter() - start}
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
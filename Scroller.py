@@ -0,0 +1,139 @@
+import time
+
+from .BiColor import BiColor
+from .Font import Font
+
+
+__all__ = ['Scroller']
+
+
+class Scroller(object):
+    '''
+       Scroll text across an EightByEight or BiColor matrix
+
+       The message is rendered once into a column strip (a bytearray
+       holding one byte per column, padded with a blank screen on each
+       end.) Each step is an 8 column memoryview slice of the strip,
+       converted by the device's packColumns() lookup tables; so, there
+       is no per-pixel work while scrolling, and only changed rows or
+       columns are sent.
+
+       - device (EightByEight or BiColor)
+       - text (str)
+       - colors (BiColor only; one color code, or a code per character;
+         default GREEN)
+       - fps (columns per second, default 30)
+       - font (default Font)
+
+       Example:
+       >>> from HT16K33 import BiColor
+       >>> square = BiColor().setUp()
+       >>> scroller = Scroller(square, "Hi", colors=[BiColor.RED, BiColor.YELLOW])
+       >>> len(list(scroller.steps()))
+       21
+       >>> scroller.step(8)[0x0F], scroller.step(8)[0x0E]
+       (127, 0)
+       >>> scroller.run(fps=float("inf")).shown
+       21
+       >>> Scroller(square, "Hello", colors=[BiColor.RED])
+       Traceback (most recent call last):
+       ...
+       ValueError: Expected 5 colors, one per character, got 1
+    '''
+
+    def __init__(self, device, text, colors=None, fps=30, font=Font):
+        self.device = device
+        self.text = text
+        self.fps = fps
+        self.font = font
+        self.running = False
+        self.shown = 0
+        self.dropped = 0
+        padding = bytearray(8)
+        if isinstance(device, BiColor):
+            if colors is None:
+                colors = BiColor.GREEN
+            if isinstance(colors, int):
+                colors = [colors] * len(text)
+            colors = list(colors)
+            if len(colors) != len(text):
+                raise ValueError("Expected %d colors, one per character, got %d" % (len(text), len(colors)))
+            green = bytearray(padding)
+            red = bytearray(padding)
+            for character, color in zip(text, colors):
+                columns = font.render(character)
+                blank = bytearray(len(columns))
+                green += columns if color & BiColor.GREEN else blank
+                red += columns if color & BiColor.RED else blank
+            self.strips = (memoryview(green + padding), memoryview(red + padding))
+        else:
+            self.strips = (memoryview(padding + font.render(text) + padding),)
+
+    def __len__(self):
+        return len(self.strips[0]) - 7
+
+    def step(self, offset):
+        '''
+           Return the display RAM image with the strip scrolled offset
+           columns to the left
+        '''
+        return self.device.packColumns(*[strip[offset:offset + 8] for strip in self.strips])
+
+    def steps(self):
+        '''
+           Iterate display RAM images, text entering on the right, and
+           leaving on the left
+        '''
+        for offset in range(len(self)):
+            yield self.step(offset)
+
+    def run(self, loops=1, fps=None, clock=time.monotonic, sleep=time.sleep):
+        '''
+           Scroll the message on a drift free schedule, until done or
+           stop() is called
+           - loops (int, default 1) None is forever
+           - fps (default None for self.fps; float("inf") as fast as
+             possible)
+
+           When scrolling falls a whole step behind, late steps are
+           dropped to catch up. Counters shown & dropped hold the result.
+        '''
+        if fps is None:
+            fps = self.fps
+        if fps <= 0:
+            raise ValueError("fps must be positive, got %r" % fps)
+        total = None if loops is None else int(loops) * len(self)
+        period = 1.0 / fps
+        self.shown = self.dropped = 0
+        self.running = True
+        start = clock()
+        tick = 0
+        while self.running and (total is None or tick < total):
+            if period:
+                deadline = start + tick * period
+                now = clock()
+                if now < deadline:
+                    sleep(deadline - now)
+                else:
+                    late = int((now - deadline) / period)
+                    if total is not None:
+                        late = min(late, total - 1 - tick)
+                    tick += late
+                    self.dropped += late
+            self.device.writeFrame(self.step(tick % len(self)))
+            self.shown += 1
+            tick += 1
+        self.running = False
+        return self
+
+    def stop(self):
+        '''
+           Stop run() before the next step (i.e. from another thread)
+        '''
+        self.running = False
+        return self
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
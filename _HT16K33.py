@@ -1,32 +1,230 @@
 #!/bin/env python
 
 from __future__ import print_function
+from contextlib import contextmanager
+import importlib
+import os
+import sys
+import threading
 
-try:
-    from smbus import SMBus
-except ImportError:
-    print('''
-    \033[1;93m!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-    \033[1;93m!\033[1;91m Unable to load SMBus            \033[1;93m!
-    \033[1;93m!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
-    \033[1;93m!\033[0;91m Switching to terminal emulation \033[1;93m!
-    \033[1;93m!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!\033[0m
-    ''')
-    import sys
-    class SMBus(object):
-        memory = {0:0, 2:0, 4:0, 6:0, 8:0, 10:0, 12:0, 14:0}
-        debug = True
-        def __init__(self, bus=0):
-            self.bus = bus
-            self.debug =  __name__ != "__main__" 
-        def write_byte(self, address, byte):
-            sys.stderr.write( "[%d:0x%0.2X] Writing byte 0x%0.2X\n" % (self.bus, address, byte) )
-        def write_byte_data(self, address, byte, value):
-            self.memory[byte] = value
-            sys.stderr.write( "[%d:0x%0.2X] Setting byte 0x%0.2X value 0x%0.2X [%s]\n" % (self.bus, address, byte, value, bin(value)) )
-        def read_byte_data(self, address, byte):
-            sys.stderr.write( "[%d:0x%0.2X] Reading byte 0x%0.2X value 0x%0.2X [%s]\n" % (self.bus, address, byte, self.memory[byte], bin(self.memory[byte])) )
-            return self.memory[byte]
+# Multiplying 8 little-endian bytes (each 0 or 1) by this constant gathers
+# their low bits into bits 56..63 of the product.
+_GATHER = sum(1 << (7 * shift) for shift in range(1, 9))
+
+# Translation tables reducing pixel values to 0/1 for a given bit mask
+_MASK_TABLES = {}
+
+# 8 bytes of 0/1 for each bit of a byte value (bit 0 first)
+_UNPACK = [bytes(bytearray((value >> bit) & 0x01 for bit in range(8))) for value in range(0x100)]
+
+# bytes.translate() table reversing the bit order of every byte
+_REVERSE = bytes(bytearray(sum(((value >> bit) & 0x01) << (7 - bit) for bit in range(8))
+                           for value in range(0x100)))
+
+# Orientation (flip x, flip y, transpose) of each 90 degree clockwise turn
+_ROTATIONS = ((0, 0, 0), (0, 1, 1), (1, 1, 0), (1, 0, 1))
+
+
+def _packBits(values):
+    '''
+       Pack 8 bytes of 0/1 into a single byte (first byte is bit 0)
+    '''
+    return ((int.from_bytes(bytes(values), "little") * _GATHER) >> 56) & 0xFF
+
+
+def _pixelBuffer(pixels, lit=False):
+    '''
+       Flatten 8x8 pixels into 64 bytes, row by row
+       - pixels (nested lists, or any buffer-protocol object)
+       - lit (Boolean, default False) reduce values to 1 if non-zero,
+         else 0; rather than to their low byte
+    '''
+    if lit:
+        convert = lambda value: int(value != 0)
+    else:
+        convert = lambda value: int(value) % 0x100
+    try:
+        view = memoryview(pixels)
+    except TypeError:
+        buffer = bytearray()
+        for row in pixels:
+            buffer.extend(convert(value) for value in row)
+    else:
+        if view.itemsize == 1 and view.c_contiguous:
+            buffer = view.tobytes()
+        else:
+            values = view.tolist()
+            if view.ndim > 1:
+                values = [value for row in values for value in row]
+            buffer = bytearray(convert(value) for value in values)
+    if len(buffer) != 64:
+        raise ValueError("Expected 8x8 pixels, got %d values" % len(buffer))
+    return bytes(buffer)
+
+
+def _packPlanes(pixels, masks=None, columns=False):
+    '''
+       Pack 8x8 pixels into 8 byte bit planes
+       - pixels (NumPy array, nested lists, or buffer-protocol object)
+       - masks (tuple of pixel value bits, one plane per mask; default
+         None is a single plane of every non-zero pixel)
+       - columns (Boolean, default False)
+
+       Byte n of each plane holds row n, with bit m set for column m
+       (or column n & row m, if columns is True.) NumPy arrays are
+       packed with vectorized operations; everything else eight pixels
+       at a time.
+    '''
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(pixels, numpy.ndarray):
+        pixels = pixels.reshape(8, 8)
+        if columns:
+            pixels = pixels.T
+        if masks is None:
+            return [bytearray(numpy.packbits(pixels != 0, axis=1, bitorder="little").tobytes())]
+        if pixels.dtype == bool:
+            pixels = pixels.view(numpy.uint8)
+        return [bytearray(numpy.packbits((pixels & mask) != 0, axis=1, bitorder="little").tobytes())
+                for mask in masks]
+    buffer = _pixelBuffer(pixels, masks is None)
+    masks = masks or (0xFF,)
+    planes = []
+    for mask in masks:
+        if mask not in _MASK_TABLES:
+            _MASK_TABLES[mask] = bytes(bytearray(int(bool(value & mask)) for value in range(0x100)))
+        plane = buffer.translate(_MASK_TABLES[mask])
+        if columns:
+            planes.append(bytearray(_packBits(plane[index::8]) for index in range(8)))
+        else:
+            planes.append(bytearray(_packBits(plane[index * 8:index * 8 + 8]) for index in range(8)))
+    return planes
+
+
+def _changedMask(old, new):
+    '''
+       Return bit mask of registers differing between two 16 byte frames
+    '''
+    # XOR both frames as 128-bit integers; then fold each changed byte
+    # down to a single bit of the register mask
+    changes = int.from_bytes(bytes(old), "little") ^ int.from_bytes(bytes(new), "little")
+    mask = 0
+    register = 0
+    while changes:
+        if changes & 0xFF:
+            mask |= 1 << register
+        changes >>= 8
+        register += 1
+    return mask
+
+
+def _transpose(plane):
+    '''
+       Transpose an 8x8 bit matrix held in a 64-bit integer (byte n is
+       row n, bit m is column m); three rounds of SWAR delta swaps, on
+       2x2, 4x4 & 8x8 blocks
+    '''
+    swap = (plane ^ (plane >> 7)) & 0x00AA00AA00AA00AA
+    plane ^= swap ^ (swap << 7)
+    swap = (plane ^ (plane >> 14)) & 0x0000CCCC0000CCCC
+    plane ^= swap ^ (swap << 14)
+    swap = (plane ^ (plane >> 28)) & 0x00000000F0F0F0F0
+    return plane ^ swap ^ (swap << 28)
+
+
+def _orientPlane(plane, orientation, inverse=False):
+    '''
+       Flip x (bit reverse table), flip y (byte order), then transpose
+       an 8x8 bit matrix; or undo it, if inverse is True
+    '''
+    flipX, flipY, transpose = orientation
+    if transpose and inverse:
+        plane = _transpose(plane)
+    if flipX:
+        plane = int.from_bytes(plane.to_bytes(8, "little").translate(_REVERSE), "little")
+    if flipY:
+        plane = int.from_bytes(plane.to_bytes(8, "little"), "big")
+    if transpose and not inverse:
+        plane = _transpose(plane)
+    return plane
+
+
+class SharedBus(object):
+  '''
+     SMBus handle shared by every device on the same bus number
+
+     Handles are pooled, and reference counted; so, many devices on one
+     bus open a single file descriptor. Each transaction holds the bus
+     lock, and callers may hold it (re-entrant) across several
+     transactions that must not interleave with other threads.
+
+     Example:
+     >>> bus = SharedBus.open(3, "emulator")
+     >>> bus is SharedBus.open(3, "emulator")
+     True
+     >>> bus.references
+     2
+     >>> bus.close().close().references
+     0
+  '''
+
+  _pool = {}
+  _poolLock = threading.Lock()
+
+  def __init__(self, number=0, backend=None):
+      self.backend, factory = Device.loadBackend(backend)
+      self.number = number
+      self.handle = factory(number)
+      self.lock = threading.RLock()
+      self.references = 0
+
+  @classmethod
+  def open(cls, number=0, backend=None):
+      '''
+         Return pooled handle for bus number, opening it if needed
+         - number (bus number, i.e. 1 for /dev/i2c-1)
+         - backend (see Device.BACKENDS, default Device.loadBackend())
+      '''
+      backend = Device.loadBackend(backend)[0]
+      with cls._poolLock:
+          bus = cls._pool.get((backend, number))
+          if bus is None:
+              bus = cls._pool[(backend, number)] = cls(number, backend)
+          bus.references += 1
+          return bus
+
+  def close(self):
+      '''
+         Release one reference; last one closes the SMBus handle
+      '''
+      with self._poolLock:
+          self.references -= 1
+          if self.references <= 0:
+              self.references = 0
+              if self._pool.get((self.backend, self.number)) is self:
+                  del self._pool[(self.backend, self.number)]
+              if hasattr(self.handle, "close"):
+                  self.handle.close()
+      return self
+
+  def read_byte_data(self, address, register):
+      with self.lock:
+          return self.handle.read_byte_data(address, register)
+
+  def read_i2c_block_data(self, address, register, length=32):
+      with self.lock:
+          return self.handle.read_i2c_block_data(address, register, length)
+
+  def write_byte(self, address, value):
+      with self.lock:
+          return self.handle.write_byte(address, value)
+
+  def write_byte_data(self, address, register, value):
+      with self.lock:
+          return self.handle.write_byte_data(address, register, value)
+
+  def write_i2c_block_data(self, address, register, values):
+      with self.lock:
+          return self.handle.write_i2c_block_data(address, register, values)
 
 
 class Device(object):
@@ -40,24 +238,461 @@ class Device(object):
   BRIGHTNESS_ADDRESS=0xE0
   OSCILLATOR=0x21
 
+  RAM_SIZE=0x10
+
+  # Key scan data (K1..K3 rows of 13 KS bits, 16 bits each) & interrupt flag
+  KEY_ADDRESS=0x40
+  KEY_SIZE=0x06
+  INTERRUPT_ADDRESS=0x60
+
+  # Flush planner cost model. Every i2c transaction pays for start,
+  # address, register & stop; each data byte costs one byte time.
+  TRANSACTION_COST=3
+  BYTE_COST=1
+
+  deferred=False
+
+  # Writes equal to the shadow RAM (or last command) are skipped. Off
+  # when another process may write the same chip; i.e. by default on
+  # backends with a skipUnchanged attribute of False, like "server"
+  skipUnchanged=True
+
+  # Bus backends by name; "module:class" strings are imported on first
+  # use. Default is HT16K33_BACKEND, else smbus, smbus2 or emulator.
+  BACKENDS = {
+    "smbus"    : "smbus:SMBus",
+    "smbus2"   : "smbus2:SMBus",
+    "emulator" : ".Emulator:Emulator",
+    "i2c-dev"  : ".I2CDev:I2CDev",
+    "server"   : ".server:ServerBus"
+  }
+  backend=None
+  _defaultBackend=None
+
+  # Counters & callbacks, once instrument() was called
+  instrumentation=None
+
+  # (flip x, flip y, transpose) once setOrientation() was called, and
+  # the display RAM image last sent in that orientation
+  orientation=None
+  physical=None
+
+  # Single worker executor per bus number (see getExecutor)
+  _executors = {}
+  _executorsLock = threading.Lock()
+
   def __init__(self,**kwargs):
       if "address" in kwargs:
           self.address = kwargs["address"]
       if "bus" in kwargs:
           self.bus = kwargs["bus"]
-      self.bus = SMBus(self.bus)
+      if "deferred" in kwargs:
+          self.deferred = bool(kwargs["deferred"])
+      if "backend" in kwargs:
+          self.backend = kwargs["backend"]
+      self.busNumber = self.bus
+      self.bus = SharedBus.open(self.busNumber, self.backend)
+      self.backend = self.bus.backend
+      if "skipUnchanged" in kwargs:
+          self.skipUnchanged = bool(kwargs["skipUnchanged"])
+      else:
+          self.skipUnchanged = getattr(self.bus.handle, "skipUnchanged", self.skipUnchanged)
+      # Shadow of the display RAM (0x00..0x0F). Every write goes through
+      # this copy, so reads never need to touch the bus.
+      self.buffer = bytearray(self.RAM_SIZE)
+      # Bit mask of shadow registers not yet sent to the device
+      self.dirty = 0x0000
+      # Bit mask of dirty registers to send even if unchanged (forced)
+      self.forced = 0x0000
+      # Bit mask of registers whose value on the chip is unknown; until
+      # first sent (or clear(), setUp() & resync()), writes always go out
+      self.unknown = (1 << self.RAM_SIZE) - 1
+      # Last command byte sent, by command group (high nibble)
+      self.commands = {}
+
+  def __enter__(self):
+      return self
+
+  def __exit__(self, *exc_info):
+      self.close()
+
+  def alterRAM(self, register, new_byte=0x00, action=None):
+      '''
+         Manipulate bits of a single display RAM register
+         - register (0x00..0x0F)
+         - new_byte (0x00..0xFF)
+         - action = ("or","xor","andnot")
+
+         The current value is taken from the shadow RAM; so, only
+         one bus write is issued.
+
+         Example:
+         >>> bus = Device().clear()
+         >>> bus.alterRAM(0x02, 0b00001111)
+         >>> bus.alterRAM(0x02, 0b00000011, "xor")
+         >>> bus.readRAM(0x02)
+         12
+      '''
+      byte = self.readRAM(register)
+      if action == "or":
+          byte |= new_byte
+      elif action == "xor":
+          byte ^= new_byte
+      elif action == "andnot":
+          byte &= ~new_byte
+      else:
+          byte = new_byte
+      self.writeRAM(register, byte)
+
+  @contextmanager
+  def batch(self):
+      '''
+         Context manager coalescing all display RAM writes into one flush
+
+         Every setRow, setColumn, setDigit, alterSingleLED... inside the
+         block only updates the shadow RAM. On exit, the last value of
+         each changed register is sent with a single flush(). Commands
+         (brightness, blink, oscillator) are not delayed. Blocks may be
+         nested; only the outer most block flushes.
+
+         Example:
+         >>> bus = Device().clear()
+         >>> with bus.batch():
+         ...   for i in range(8):
+         ...     bus.alterRAM(0x00, 1 << i, "or")
+         ...
+         >>> bus.readRAM(0x00), bus.dirty
+         (255, 0)
+      '''
+      deferred = self.deferred
+      self.deferred = True
+      try:
+          yield self
+      finally:
+          self.deferred = deferred
+          if not deferred:
+              self.flush()
 
   def clear(self):
       '''
          Loop through all data addresses, and clear any LEDS
 
          Example:
-         >>> bus = Base()
+         >>> bus = Device()
          >>> bus.clear()  # doctest: +ELLIPSIS
-         <...Base object at 0x...>
+         <...Device object at 0x...>
+      '''
+      return self.writeFrame(bytearray(self.RAM_SIZE), True)
+
+  def close(self):
+      '''
+         Release device's shared bus handle
+
+         The handle is closed once every device on the bus is closed.
+         Devices are also context managers, closed on exit.
+
+         Example:
+         >>> with Device(bus=2) as bus:
+         ...   bus.bus.references
+         1
+         >>> bus.bus is None
+         True
+      '''
+      if self.bus is not None:
+          self.bus.close()
+          self.bus = None
+      return self
+
+  def flush(self, full=False):
+      '''
+         Send pending shadow RAM changes to the device
+         - full (Boolean, default False) resend all 16 registers
+
+         Dirty registers are grouped by getFlushPlan(); isolated bytes
+         go out as single writes, and runs as block writes.
+
+         Example:
+         >>> bus = Device(deferred=True).clear()
+         >>> bus.writeRAM(0x00, 0xFF)
+         >>> bus.writeRAM(0x0E, 0xFF)
+         >>> bus.flush()  # doctest: +ELLIPSIS
+         <...Device object at 0x...>
+         >>> bus.dirty
+         0
+      '''
+      if full:
+          self.dirty = (1 << self.RAM_SIZE) - 1
+      buffer = self.buffer
+      dirty = self.dirty
+      if self.orientation is not None and dirty:
+          # Shadow RAM stays as drawn; only the copy sent is turned
+          buffer = self.orientFrame(self.buffer)
+          if self.physical is not None and not full:
+              dirty = _changedMask(self.physical, buffer)
+              if self.forced:
+                  # Plus every register forced writes land on, once turned
+                  forced = bytearray(0xFF * ((self.forced >> register) & 0x01) for register in range(self.RAM_SIZE))
+                  dirty |= _changedMask(bytearray(self.RAM_SIZE), self.orientFrame(forced))
+          self.physical = buffer
+      with self.bus.lock:
+          for start, length in self.getFlushPlan(dirty):
+              if length == 1:
+                  self.bus.write_byte_data(self.address, start, buffer[start])
+              else:
+                  self.bus.write_i2c_block_data(self.address, start, list(buffer[start:start + length]))
+      self.unknown &= ~self.dirty
+      self.dirty = self.forced = 0x0000
+      return self
+
+  def getFlushPlan(self, dirty=None):
+      '''
+         Group dirty registers into the cheapest list of transactions
+         - dirty (bit mask of registers, default pending changes)
+
+         Returns a list of (start register, length) tuples. Two runs
+         are merged into one block write when resending the clean
+         registers between them costs less than another transaction
+         (see TRANSACTION_COST & BYTE_COST.)
+
+         Example:
+         >>> bus = Device()
+         >>> bus.getFlushPlan(0b0101010000000001)
+         [(0, 1), (10, 5)]
+         >>> bus.getFlushPlan(0xFFFF)
+         [(0, 16)]
+      '''
+      if dirty is None:
+          dirty = self.dirty
+      plan = []
+      register = 0
+      while dirty >> register:
+          if not (dirty >> register) & 0x01:
+              register += 1
+              continue
+          end = register
+          while (dirty >> end) & 0x01:
+              end += 1
+          if plan:
+              start, length = plan[-1]
+              gap = register - (start + length)
+              if gap * self.BYTE_COST < self.TRANSACTION_COST:
+                  plan[-1] = (start, end - start)
+                  register = end
+                  continue
+          plan.append((register, end - register))
+          register = end
+      return plan
+
+  def getBrightness(self):
+      '''
+         Return last brightness level sent (0..15), or None
+      '''
+      command = self.commands.get(self.BRIGHTNESS_ADDRESS)
+      return None if command is None else command & 0x0F
+
+  def getDisplay(self):
       '''
-      for i in range(0x10):
-          self.bus.write_byte_data(self.address, i, 0x00)
+         Return last display options sent as (on, blink_rate), or None
+      '''
+      command = self.commands.get(self.DISPLAY_ADDRESS)
+      return None if command is None else (bool(command & 0x01), (command >> 1) & 0x03)
+
+  def getExecutor(self):
+      '''
+         Return the single thread executor dedicated to device's bus
+
+         All devices on the same bus number share one worker; so,
+         transactions queued on it never interleave, while other
+         buses are driven in parallel.
+
+         Example:
+         >>> Device(bus=1).getExecutor() is Device(bus=1).getExecutor()
+         True
+      '''
+      with Device._executorsLock:
+          if self.busNumber not in Device._executors:
+              from concurrent.futures import ThreadPoolExecutor
+              Device._executors[self.busNumber] = ThreadPoolExecutor(max_workers=1)
+          return Device._executors[self.busNumber]
+
+  def instrument(self, enabled=True):
+      '''
+         Enable or disable transaction instrumentation
+         - enabled (Boolean, default True)
+
+         While enabled, every bus transaction of this device updates
+         the counters, latency histogram & callbacks of
+         self.instrumentation (see Instrumentation.) Disabling keeps
+         the collected data, but removes all overhead.
+
+         Example:
+         >>> bus = Device(backend="emulator").instrument()
+         >>> bus = bus.clear().instrument(False).clear()
+         >>> bus.instrumentation.transactions
+         1
+      '''
+      from .Instrumentation import Instrumentation
+      if self.instrumentation is None:
+          self.instrumentation = Instrumentation(self)
+      if enabled and self.bus is not self.instrumentation:
+          self.instrumentation.bus = self.bus
+          self.bus = self.instrumentation
+      elif not enabled and self.bus is self.instrumentation:
+          self.bus = self.instrumentation.bus
+      return self
+
+  @classmethod
+  def loadBackend(cls, name=None):
+      '''
+         Return (name, factory) of bus backend, importing it if needed
+         - name (see BACKENDS, default HT16K33_BACKEND environment
+           variable, else first of smbus, smbus2 & emulator to import)
+
+         Example:
+         >>> Device.loadBackend("emulator")  # doctest: +ELLIPSIS
+         ('emulator', <class '...Emulator'>)
+      '''
+      if name is None:
+          name = os.environ.get("HT16K33_BACKEND")
+      if name is None:
+          if Device._defaultBackend is None:
+              Device._defaultBackend = "emulator"
+              for candidate in ("smbus", "smbus2"):
+                  try:
+                      cls.loadBackend(candidate)
+                  except ImportError:
+                      continue
+                  Device._defaultBackend = candidate
+                  break
+          name = Device._defaultBackend
+      if name not in cls.BACKENDS:
+          raise ValueError("Unknown bus backend %r" % name)
+      factory = cls.BACKENDS[name]
+      if isinstance(factory, str):
+          module, attribute = factory.split(":")
+          factory = getattr(importlib.import_module(module, __package__), attribute)
+          cls.BACKENDS[name] = factory
+      return name, factory
+
+  def orientFrame(self, frame, inverse=False):
+      '''
+         Return frame turned to the device's orientation (or back, if
+         inverse is True)
+         - frame (16 byte display RAM image)
+
+         Each 8x8 plane is turned as a 64-bit integer; see fromPlanes()
+         & toPlanes() of EightByEight & BiColor (64-bit integers; byte n
+         is row n, bit m is column m.)
+      '''
+      return self.fromPlanes([_orientPlane(plane, self.orientation, inverse)
+                              for plane in self.toPlanes(frame)])
+
+  def packFrame(self, buffer):
+      '''
+         Convert a bytes-like frame into a 16 byte display RAM image
+         - buffer (bytes, bytearray, memoryview or list, up to 16 bytes)
+
+         Sub-classes accept their own frame formats (pixels, digits...)
+         Nothing is sent to the device.
+
+         Example:
+         >>> Device().packFrame([0x01, 0x02])[:4]
+         bytearray(b'\\x01\\x02\\x00\\x00')
+      '''
+      frame = bytearray(buffer)
+      if len(frame) > self.RAM_SIZE:
+          raise ValueError("Frame larger than %d bytes" % self.RAM_SIZE)
+      return frame + bytearray(self.RAM_SIZE - len(frame))
+
+  @classmethod
+  def registerBackend(cls, name, factory):
+      '''
+         Add bus backend
+         - name (str)
+         - factory (callable taking the bus number, or "module:class")
+
+         Returned objects must implement SMBus's write_byte,
+         write_byte_data, read_byte_data, write_i2c_block_data &
+         read_i2c_block_data.
+      '''
+      cls.BACKENDS[name] = factory
+
+  def readInterrupt(self):
+      '''
+         Return True if a key was pressed since key RAM was last read
+
+         A single byte read; cheaper than readKeys() for polling.
+      '''
+      return bool(self.bus.read_byte_data(self.address, self.INTERRUPT_ADDRESS))
+
+  def readKeys(self):
+      '''
+         Return keys held down as a bit mask, with a single block read
+
+         Key numbers (bit positions) are 16 * row + column; row (K1..K3
+         as 0..2), column (KS0..KS12 as 0..12.) Reading key RAM clears
+         the interrupt flag.
+
+         Example:
+         >>> bus = Device(backend="emulator", address=0x77)
+         >>> bus.bus.handle.press(0x77, 17)
+         >>> bus.readInterrupt(), bin(bus.readKeys()), bus.readInterrupt()
+         (True, '0b100000000000000000', False)
+      '''
+      keys = bytearray(self.bus.read_i2c_block_data(self.address, self.KEY_ADDRESS, self.KEY_SIZE))
+      return int.from_bytes(bytes(keys), "little")
+
+  def readRAM(self, register):
+      '''
+         Return value of display RAM register from the shadow copy
+         - register (0x00..0x0F)
+
+         Example:
+         >>> bus = Device().clear()
+         >>> bus.writeRAM(0x03, 0xA5)
+         >>> bus.readRAM(0x03)
+         165
+      '''
+      return self.buffer[int(register) % self.RAM_SIZE]
+
+  def resync(self):
+      '''
+         Reload the shadow RAM from the device
+
+         Only needed if something other than this object has
+         written to the display RAM.
+
+         Example:
+         >>> bus = Device()
+         >>> bus.resync()  # doctest: +ELLIPSIS
+         <...Device object at 0x...>
+      '''
+      buffer = bytearray(self.bus.read_i2c_block_data(self.address, 0x00, self.RAM_SIZE))
+      if self.orientation is not None:
+          self.physical = buffer
+          buffer = self.orientFrame(buffer, True)
+      self.buffer[:] = buffer
+      self.dirty = self.forced = self.unknown = 0x0000
+      return self
+
+  def setDeferred(self, deferred=True):
+      '''
+         Enable or disable deferred writes
+         - deferred (Boolean, default True)
+
+         While deferred, register writes only update the shadow RAM,
+         and mark it dirty, until flush() is called. Turning deferred
+         mode off flushes any pending changes.
+
+         Example:
+         >>> bus = Device().clear().setDeferred()
+         >>> bus.writeRAM(0x01, 0x0F)
+         >>> bus.setDeferred(False).dirty
+         0
+      '''
+      self.deferred = bool(deferred)
+      if not self.deferred:
+          self.flush()
       return self
 
   def setBrightness(self, brightness=0x0F):
@@ -82,13 +717,12 @@ class Device(object):
          -- 15 = 16/16 duty
 
          Example:
-         >>> bus = Base()
+         >>> bus = Device()
          >>> bus.setBrightness(15) # doctest: +ELLIPSIS
-         <...Base object at 0x...>
+         <...Device object at 0x...>
       '''
       brightness = int(brightness) % 0x10
-      self.bus.write_byte(self.address, self.BRIGHTNESS_ADDRESS | brightness )
-      return self
+      return self.writeCommand(self.BRIGHTNESS_ADDRESS | brightness)
 
   def setDisplay(self, on=True, blink_rate=0x00):
       '''
@@ -101,13 +735,52 @@ class Device(object):
          -- 3 = 0.5HZ
 
          Example:
-         >>> bus = Base()
+         >>> bus = Device()
          >>> bus.setDisplay(True, 4) #doctest: +ELLIPSIS
-         <...Base object at 0x...>
+         <...Device object at 0x...>
       '''
       blink_rate = int(blink_rate) % 0x04
       on = int(on) % 0x02
-      self.bus.write_byte( self.address, self.DISPLAY_ADDRESS | (blink_rate << 0x01) | on )
+      return self.writeCommand(self.DISPLAY_ADDRESS | (blink_rate << 0x01) | on)
+
+  def setOrientation(self, rotation=0, mirrorX=False, mirrorY=False):
+      '''
+         Turn the display to match how it is mounted
+         - rotation (0, 90, 180 or 270 degrees clockwise)
+         - mirrorX (Boolean, default False) flip left & right, after rotation
+         - mirrorY (Boolean, default False) flip top & bottom, after rotation
+
+         Applied when flushing; the shadow RAM, and every method
+         reading it, keeps the image as drawn. Only classes with 8x8
+         bit planes (toPlanes & fromPlanes, i.e. EightByEight &
+         BiColor) can be turned.
+
+         Example:
+         >>> from HT16K33 import EightByEight
+         >>> matrix = EightByEight(backend="emulator", bus=5).setUp().setOrientation(90)
+         >>> matrix.setRow(0, [True])
+         >>> matrix.getFrame()[0][0], matrix.bus.handle.getRAM(0x70)[0x00]
+         (True, 64)
+         >>> matrix.bus.write_byte_data(0x70, 0x05, 0x5A)  # drawn by someone else
+         >>> matrix.clear().bus.handle.getRAM(0x70)[0x05]  # forced writes are still sent
+         0
+      '''
+      if not hasattr(self, "toPlanes"):
+          raise ValueError("%s can not be turned" % type(self).__name__)
+      if rotation % 90:
+          raise ValueError("Rotation must be a multiple of 90 degrees")
+      flipX, flipY, transpose = _ROTATIONS[rotation % 360 // 90]
+      # A mirror after a transpose flips the other axis
+      if mirrorX:
+          flipY, flipX = (flipY ^ 1, flipX) if transpose else (flipY, flipX ^ 1)
+      if mirrorY:
+          flipY, flipX = (flipY, flipX ^ 1) if transpose else (flipY ^ 1, flipX)
+      self.orientation = (flipX, flipY, transpose) if flipX or flipY or transpose else None
+      # Redraw everything in the new orientation
+      self.physical = None
+      self.dirty = (1 << self.RAM_SIZE) - 1
+      if not self.deferred:
+          self.flush()
       return self
 
   def setUp(self,**kwargs):
@@ -124,9 +797,12 @@ class Device(object):
        - blink_rate (0x00..0x03, default 0x00)
        - brightness (0x00..0x0F, default 0x07)
 
+       Every command is sent, even if cached as already sent.
+
        Example:
-       >>> bus = Base().setUp()
+       >>> bus = Device().setUp()
     '''
+    self.commands.clear()
     self.clear() # Clear out manufacturer's test message
     self.turnOnOscillator() # Start internal oscillator
     self.setDisplay(args["display_on"], args["blink_rate"])
@@ -138,25 +814,154 @@ class Device(object):
          Enable HT16K33 internal system oscillator
 
          Example:
-         >>> bus = Base()
+         >>> bus = Device()
          >>> bus.turnOnOscillator() # doctest: +ELLIPSIS
-         <...Base object at 0x...>
+         <...Device object at 0x...>
       '''
-      self.bus.write_byte(self.address, self.OSCILLATOR)
-      return self
+      return self.writeCommand(self.OSCILLATOR)
 
   def turnOffOscillator(self):
       '''
          Disable HT16K33 internal system oscillator
 
          Example:
-         >>> bus = Base()
+         >>> bus = Device()
          >>> bus.turnOffOscillator()  # doctest: +ELLIPSIS
-         <...Base object at 0x...>
+         <...Device object at 0x...>
+      '''
+      return self.writeCommand(self.OSCILLATOR^0x01)
+
+  def writeCommand(self, command, force=False):
       '''
-      self.bus.write_byte(self.address, self.OSCILLATOR^0x01)
+         Send a one byte command (display, brightness or oscillator)
+         - command (0x00..0xFF)
+         - force (Boolean, default False) send even if already sent
+
+         The last command of each group (high nibble) is cached; a
+         command identical to the last one sent is skipped. So,
+         effects can set brightness on every step at no bus cost.
+
+         Example:
+         >>> bus = Device(backend="emulator").instrument()
+         >>> bus = bus.setBrightness(3).setBrightness(3).setBrightness(4)
+         >>> bus.instrumentation.transactions
+         2
+         >>> bus.getBrightness()
+         4
+      '''
+      group = command & 0xF0
+      if not force and self.skipUnchanged and self.commands.get(group) == command:
+          return self
+      self.bus.write_byte(self.address, command)
+      self.commands[group] = command
+      return self
+
+  def writeDiff(self, diff):
+      '''
+         Replay a precomputed Diff (see DiffEncoder)
+         - diff (Diff)
+
+         The diff's transactions are sent as planned, without comparing
+         or planning again; it assumes the display holds the frame the
+         diff was encoded from. In deferred mode, or with changes still
+         pending, registers are only merged into the shadow RAM.
+
+         Example:
+         >>> from HT16K33.FrameDiff import DiffEncoder
+         >>> bus = Device().clear()
+         >>> bus.writeDiff(DiffEncoder().encode(b"\\x00\\x81"))  # doctest: +ELLIPSIS
+         <...Device object at 0x...>
+         >>> bus.readRAM(0x01)
+         129
+      '''
+      if self.deferred or self.dirty or self.orientation is not None:
+          for start, data in diff.writes:
+              for register, value in enumerate(bytearray(data), start):
+                  if self.buffer[register] != value:
+                      self.buffer[register] = value
+                      self.dirty |= 1 << register
+                  elif not self.skipUnchanged or (self.unknown >> register) & 0x01:
+                      self.forced |= 1 << register
+                      self.dirty |= 1 << register
+          if not self.deferred:
+              self.flush()
+          return self
+      with self.bus.lock:
+          for start, data in diff.writes:
+              self.buffer[start:start + len(data)] = data
+              if len(data) == 1:
+                  self.bus.write_byte_data(self.address, start, data[0])
+              else:
+                  self.bus.write_i2c_block_data(self.address, start, list(data))
+      return self
+
+  def writeFrame(self, buffer, force=False):
+      '''
+         Replace display RAM with a bytes-like frame
+         - buffer (bytes, bytearray, memoryview or list, up to 16 bytes)
+         - force (Boolean, default False) send every register in frame
+
+         The HT16K33 auto-increments its RAM pointer; so, a full frame
+         is sent as a single block write starting at 0x00. Registers
+         already holding the same value are skipped, and a frame
+         shorter than 16 bytes leaves the remaining registers untouched.
+
+         Example:
+         >>> bus = Device().clear()
+         >>> bus.writeFrame(b"\\xff\\x00\\x81")  # doctest: +ELLIPSIS
+         <...Device object at 0x...>
+         >>> bus.readRAM(0x02)
+         129
+      '''
+      frame = bytearray(buffer)
+      if len(frame) > self.RAM_SIZE:
+          raise ValueError("Frame larger than %d bytes" % self.RAM_SIZE)
+      forced = (1 << len(frame)) - 1
+      if not force and self.skipUnchanged:
+          forced &= self.unknown
+      self.forced |= forced
+      self.dirty |= forced
+      for register, value in enumerate(frame):
+          if self.buffer[register] != value:
+              self.buffer[register] = value
+              self.dirty |= 1 << register
+      if not self.deferred:
+          self.flush()
       return self
 
+  def writeRAM(self, register, value=0x00):
+      '''
+         Write single display RAM register, and keep shadow RAM in sync
+         - register (0x00..0x0F)
+         - value (0x00..0xFF)
+
+         Nothing is sent if the register already holds value; unless
+         skipUnchanged is False, or the chip's value is still unknown
+         (see unknown.) In deferred mode the register is only marked
+         dirty.
+
+         Example:
+         >>> bus = Device().clear()
+         >>> bus.writeRAM(0x0F, 0x1FF)
+         >>> bus.readRAM(0x0F)
+         255
+         >>> bus = Device(backend="emulator", bus=6).instrument()
+         >>> bus.writeRAM(0x00, 0x00)  # sent; the chip may hold anything
+         >>> bus.writeRAM(0x00, 0x00)
+         >>> bus.instrumentation.transactions
+         1
+      '''
+      register = int(register) % self.RAM_SIZE
+      value = int(value) % 0x100
+      if self.buffer[register] == value:
+          if self.skipUnchanged and not (self.unknown >> register) & 0x01:
+              return
+          self.forced |= 1 << register
+      self.buffer[register] = value
+      self.dirty |= 1 << register
+      if not self.deferred:
+          self.flush()
+
 
 if __name__ == "__main__":
     import doctest
@@ -1,5 +1,28 @@
-__all__ = ['BiColor', 'EightByEight', 'FourDigit']
+__all__ = ['Animation', 'AnimationFile', 'AsyncBiColor', 'AsyncEightByEight', 'AsyncFourDigit',
+           'BiColor', 'Clock', 'Diff', 'DiffEncoder', 'DisplayGroup', 'Effects', 'EightByEight', 'Emulator', 'Font', 'FourDigit',
+           'Histogram', 'Instrumentation', 'KeyEvent', 'KeyScanner', 'Marquee', 'Recorder', 'Scroller']
 
+from .Animation import Animation
+from .AnimationFile import AnimationFile
 from .BiColor import BiColor
+from .Clock import Clock
+from .DisplayGroup import DisplayGroup
+from .Effects import Effects
 from .EightByEight import EightByEight
+from .Emulator import Emulator
+from .Font import Font
 from .FourDigit import FourDigit
+from .FrameDiff import Diff, DiffEncoder
+from .Instrumentation import Histogram, Instrumentation
+from .KeyScanner import KeyEvent, KeyScanner
+from .Marquee import Marquee
+from .Recorder import Recorder
+from .Scroller import Scroller
+
+
+def __getattr__(name):
+    # asyncio is slow to import; load the async classes on first use
+    if name in ('AsyncBiColor', 'AsyncEightByEight', 'AsyncFourDigit'):
+        from . import AsyncDevice
+        return getattr(AsyncDevice, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,197 @@
+#!/bin/env python
+
+# Benchmark bus cost of the public API against the in-memory emulator
+#
+#   $ python -m HT16K33.bench -o bench.json
+#   $ python -m HT16K33.bench --compare bench.json
+
+from __future__ import print_function
+import argparse
+import json
+import sys
+import time
+
+from .BiColor import BiColor
+from .DisplayGroup import DisplayGroup
+from .EightByEight import EightByEight
+from .FourDigit import FourDigit
+from .FrameDiff import DiffEncoder
+from ._HT16K33 import Device
+
+
+__all__ = ['BENCHMARKS', 'estimateWallTime', 'measure', 'run']
+
+# Clocks per transaction (start, address byte & ack, stop), and per byte
+TRANSACTION_CLOCKS = 11
+BYTE_CLOCKS = 9
+
+BUS_SPEEDS = (100000, 400000)
+
+
+def estimateWallTime(transactions, length, speed=100000):
+    '''
+       Estimate seconds spent on the wire for i2c traffic
+       - transactions (count)
+       - length (bytes after address byte)
+       - speed (bus clock Hz)
+
+       Example:
+       >>> round(estimateWallTime(1, 17, 400000) * 1e6, 1)
+       410.0
+    '''
+    return (transactions * TRANSACTION_CLOCKS + length * BYTE_CLOCKS) / float(speed)
+
+
+def _handles(devices):
+    handles = []
+    for device in devices:
+        if device.bus.handle not in handles:
+            handles.append(device.bus.handle)
+    return handles
+
+
+def measure(name, setup, operation, iterations=1000):
+    '''
+       Run operation(devices, index) iterations times, and report cost
+       - name (str)
+       - setup (callable returning list of devices on emulator backend)
+       - operation (callable)
+       - iterations (int)
+
+       Example:
+       >>> result = measure("clear", lambda: [Device(backend="emulator")],
+       ...                  lambda devices, index: devices[0].clear(), 10)
+       >>> result["transactions_per_op"], result["bytes_per_op"]
+       (1.0, 17.0)
+    '''
+    devices = setup()
+    handles = _handles(devices)
+    for handle in handles:
+        handle.resetCounters()
+    start = time.perf_counter()
+    for index in range(iterations):
+        operation(devices, index)
+    elapsed = time.perf_counter() - start
+    transactions = sum(handle.transactions for handle in handles)
+    length = sum(handle.bytes for handle in handles)
+    for device in devices:
+        device.close()
+    result = {
+        "name": name,
+        "iterations": iterations,
+        "transactions_per_op": transactions / float(iterations),
+        "bytes_per_op": length / float(iterations),
+        "ops_per_sec": iterations / elapsed if elapsed else float("inf"),
+    }
+    for speed in BUS_SPEEDS:
+        result["wall_us_%dkhz" % (speed // 1000)] = estimateWallTime(transactions, length, speed) / iterations * 1e6
+    return result
+
+
+def _devices(cls, count=1, buses=1):
+    return lambda: [cls(bus=index % buses, address=0x70 + index // buses, backend="emulator").setUp()
+                    for index in range(count)]
+
+
+def _groupFrame(devices, index):
+    group = DisplayGroup(devices)
+    with group.batch():
+        for device in devices:
+            device.setFrame(FRAMES[index % 2])
+
+
+FRAMES = ([[(x + y) % 2 for x in range(8)] for y in range(8)],
+          [[(x + y + 1) % 2 for x in range(8)] for y in range(8)])
+# Checkerboards as raw display RAM, and the diffs between them
+RAM_FRAMES = (bytes(bytearray([0x55, 0x00, 0xAA, 0x00] * 4)),
+              bytes(bytearray([0xAA, 0x00, 0x55, 0x00] * 4)))
+_encoder = DiffEncoder(RAM_FRAMES[1])
+DIFFS = (_encoder.encode(RAM_FRAMES[0]), _encoder.encode(RAM_FRAMES[1]))
+IMAGES = ([[(x + y) % 4 for x in range(8)] for y in range(8)],
+          [[(x + y + 1) % 4 for x in range(8)] for y in range(8)])
+
+# (name, setup, operation)
+BENCHMARKS = [
+    ("Device.clear", _devices(Device),
+     lambda devices, index: devices[0].clear()),
+    ("Device.setUp", _devices(Device),
+     lambda devices, index: devices[0].setUp()),
+    ("Device.writeFrame", _devices(Device),
+     lambda devices, index: devices[0].writeFrame(RAM_FRAMES[index % 2])),
+    ("Device.writeDiff", _devices(Device),
+     lambda devices, index: devices[0].writeDiff(DIFFS[index % 2])),
+    ("EightByEight.setFrame", _devices(EightByEight),
+     lambda devices, index: devices[0].setFrame(FRAMES[index % 2])),
+    ("EightByEight.setFrame rotated 90", lambda: [device.setOrientation(90) for device in _devices(EightByEight)()],
+     lambda devices, index: devices[0].setFrame(FRAMES[index % 2])),
+    ("EightByEight.setRow x8", _devices(EightByEight),
+     lambda devices, index: [devices[0].setRow(row, index) for row in range(8)]),
+    ("EightByEight.toggleLED", _devices(EightByEight),
+     lambda devices, index: devices[0].toggleLED(index % 8, index // 8 % 8)),
+    ("BiColor.setImage", _devices(BiColor),
+     lambda devices, index: devices[0].setImage(IMAGES[index % 2])),
+    ("BiColor.toggleRedLED", _devices(BiColor),
+     lambda devices, index: devices[0].toggleRedLED(index % 8, index // 8 % 8)),
+    ("FourDigit.writeDigit x4", _devices(FourDigit),
+     lambda devices, index: [devices[0].writeDigit(position, character)
+                             for position, character in enumerate("%04d" % (index % 10000))]),
+    ("FourDigit.writeString", _devices(FourDigit),
+     lambda devices, index: devices[0].writeString("%02d:%02d" % (index // 60 % 100, index % 60))),
+    ("FourDigit.writeNumber", _devices(FourDigit),
+     lambda devices, index: devices[0].writeNumber(index % 10000)),
+    ("DisplayGroup.flush 16 devices / 2 buses", _devices(EightByEight, 16, 2), _groupFrame),
+]
+
+
+def run(iterations=1000, names=None):
+    '''
+       Run every benchmark (or those whose name contains one of names)
+    '''
+    return [measure(name, setup, operation, iterations)
+            for name, setup, operation in BENCHMARKS
+            if not names or any(part in name for part in names)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m HT16K33.bench",
+                                     description="Measure bus transactions, bytes & speed of HT16K33 calls")
+    parser.add_argument("names", nargs="*", help="only run benchmarks matching these names")
+    parser.add_argument("-n", "--iterations", type=int, default=1000)
+    parser.add_argument("-o", "--output", help="save results as JSON")
+    parser.add_argument("-c", "--compare", help="previous JSON results to compare bus traffic with")
+    args = parser.parse_args(argv)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as handle:
+            saved = json.load(handle)
+        # Workloads cycle through inputs; traffic per op depends on the count
+        if saved.get("iterations") != args.iterations:
+            parser.error("%s was measured with -n %s; compare with the same iteration count"
+                         % (args.compare, saved.get("iterations")))
+        previous = dict((result["name"], result) for result in saved["results"])
+
+    results = run(args.iterations, args.names)
+
+    print("%-42s %8s %8s %12s %11s %11s" % ("benchmark", "txn/op", "bytes/op", "ops/sec", "us@100kHz", "us@400kHz"))
+    regressions = 0
+    for result in results:
+        line = "%-42s %8.2f %8.2f %12.0f %11.1f %11.1f" % (
+            result["name"], result["transactions_per_op"], result["bytes_per_op"],
+            result["ops_per_sec"], result["wall_us_100khz"], result["wall_us_400khz"])
+        before = previous.get(result["name"])
+        if before and (result["transactions_per_op"] > before["transactions_per_op"] or
+                       result["bytes_per_op"] > before["bytes_per_op"]):
+            line += "  REGRESSION (was %.2f txn, %.2f bytes)" % (before["transactions_per_op"], before["bytes_per_op"])
+            regressions += 1
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"version": Device.VERSION, "iterations": args.iterations, "results": results},
+                      handle, indent=2, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
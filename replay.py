@@ -0,0 +1,31 @@
+#!/bin/env python
+
+# Replay a bus capture made with HT16K33.Recorder
+#
+#   $ python -m HT16K33.replay field.cap --backend emulator --max-speed
+
+from __future__ import print_function
+import argparse
+import json
+import sys
+
+from .Recorder import Recorder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m HT16K33.replay",
+                                     description="Re-execute a HT16K33 bus capture")
+    parser.add_argument("capture", help="capture file written by Recorder")
+    parser.add_argument("-b", "--backend", help="bus backend (default HT16K33_BACKEND, smbus...)")
+    parser.add_argument("-s", "--speed", type=float, default=1.0, help="time scale (default 1.0)")
+    parser.add_argument("-m", "--max-speed", action="store_true", help="ignore original timing")
+    args = parser.parse_args(argv)
+
+    with open(args.capture, "rb") as capture:
+        result = Recorder.replay(capture, args.backend, None if args.max_speed else args.speed)
+    print(json.dumps(result, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
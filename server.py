@@ -0,0 +1,388 @@
+#!/bin/env python
+
+# Display server owning the HT16K33 buses; clients connect over a Unix socket
+#
+#   $ python -m HT16K33.server --socket /tmp/HT16K33.sock --rate 60
+#   >>> EightByEight(backend="server").setUp()
+
+from __future__ import print_function
+import argparse
+import os
+import selectors
+import signal
+import socket
+import struct
+import sys
+import time
+
+from ._HT16K33 import Device
+
+
+__all__ = ['Server', 'ServerBus', 'main']
+
+SOCKET = os.environ.get("HT16K33_SOCKET", "/tmp/HT16K33.sock")
+
+# Request: operation, bus, address, register & payload length, then
+# payload. Reads are answered with the length, then the bytes read.
+MESSAGE = struct.Struct("<BBBBB")
+REPLY = struct.Struct("<B")
+OPERATIONS = ("write_byte", "write_byte_data", "read_byte_data",
+              "write_i2c_block_data", "read_i2c_block_data")
+WRITE_BYTE, WRITE_BYTE_DATA, READ_BYTE_DATA, WRITE_BLOCK, READ_BLOCK = range(len(OPERATIONS))
+
+
+class ServerBus(object):
+    '''
+       Bus backend talking to a display Server (registered as "server")
+
+       Any device class works unchanged on top of it; i.e.
+       EightByEight(backend="server"). Each SMBus call is one message;
+       a 16 byte frame costs 21 bytes on the socket. Reads wait for the
+       server's answer.
+
+       Several processes may share a display; each keeps its own shadow
+       RAM, which goes stale as soon as another process draws. So,
+       devices on this backend send every write, even if unchanged
+       (see Device.skipUnchanged); the server merges them, and the
+       latest write wins. Call resync() only to read back the image.
+
+       - bus (bus number on the server)
+       - path (socket path, default HT16K33_SOCKET environment variable,
+         else /tmp/HT16K33.sock)
+    '''
+
+    # Device writes are never skipped; the server drops what is unchanged
+    skipUnchanged = False
+
+    def __init__(self, bus=0, path=None):
+        self.bus = bus
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path or SOCKET)
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+    def send(self, operation, address, register, payload=b""):
+        self.socket.sendall(MESSAGE.pack(operation, self.bus, address, register, len(payload)) + bytes(payload))
+
+    def receive(self, length):
+        data = bytearray()
+        while len(data) < length:
+            chunk = self.socket.recv(length - len(data))
+            if not chunk:
+                raise IOError("HT16K33 server closed the connection")
+            data += chunk
+        return data
+
+    def read(self, operation, address, register, length):
+        self.send(operation, address, register, bytearray((length,)))
+        length, = REPLY.unpack(bytes(self.receive(REPLY.size)))
+        if not length:
+            raise IOError("HT16K33 server could not read 0x%0.2X:0x%0.2X" % (address, register))
+        return list(self.receive(length))
+
+    def write_byte(self, address, value):
+        self.send(WRITE_BYTE, address, 0, bytearray((value,)))
+
+    def write_byte_data(self, address, register, value):
+        self.send(WRITE_BYTE_DATA, address, register, bytearray((value,)))
+
+    def write_i2c_block_data(self, address, register, values):
+        self.send(WRITE_BLOCK, address, register, bytearray(values))
+
+    def read_byte_data(self, address, register):
+        return self.read(READ_BYTE_DATA, address, register, 1)[0]
+
+    def read_i2c_block_data(self, address, register, length=32):
+        return self.read(READ_BLOCK, address, register, length)
+
+
+class Server(object):
+    '''
+       Own the buses, and merge display updates from many clients
+
+       Display RAM writes from every client go into one shadow RAM per
+       chip, and commands (display, brightness, oscillator) into one
+       slot per command group; the latest write wins. Pending changes
+       are flushed at most rate times per second, each as a single
+       planned flush. RAM reads are answered from the shadow RAM; key
+       scan reads go to the chip. One thread serves every client.
+
+       - path (socket path, default HT16K33_SOCKET or /tmp/HT16K33.sock)
+       - backend (bus backend of the server, see Device.BACKENDS)
+       - rate (maximum flushes per second, default 60)
+
+       Example:
+       >>> import os, tempfile, threading
+       >>> from HT16K33 import FourDigit
+       >>> from HT16K33.Emulator import Emulator
+       >>> path = os.path.join(tempfile.mkdtemp(), "display.sock")
+       >>> server = Server(path, backend="emulator", rate=100)
+       >>> thread = threading.Thread(target=server.serve)
+       >>> thread.start()
+       >>> Device.registerBackend("test-server", lambda bus: ServerBus(bus, path))
+       >>> first = FourDigit(bus=9, backend="test-server").setUp()
+       >>> second = FourDigit(bus=9, backend="test-server")
+       >>> first.writeString("1234")
+       >>> second.resync().readAtPosition(1) == first.readAtPosition(1)
+       True
+       >>> second.writeString("5678")
+       >>> second.resync().readAtPosition(4)
+       109
+       >>> first.writeString("1234")  # sent, although first's shadow RAM holds it
+       >>> first.resync().readAtPosition(4)
+       6
+       >>> server.stop() is server and thread.join() is None
+       True
+       >>> Emulator(9).getRAM(0x70)[0x08]
+       102
+       >>> server = server.close()
+    '''
+
+    KEY_ADDRESS = Device.KEY_ADDRESS
+    INTERRUPT_ADDRESS = Device.INTERRUPT_ADDRESS
+
+    def __init__(self, path=None, backend=None, rate=60, clock=time.monotonic):
+        if Device.loadBackend(backend)[0] == "server":
+            raise ValueError("The server needs a bus backend other than itself")
+        self.path = path or SOCKET
+        self.backend = backend
+        self.period = 1.0 / rate
+        self.clock = clock
+        self.devices = {}
+        self.commands = {}
+        self.buffers = {}
+        # Replies not yet sent, by client
+        self.replies = {}
+        self.running = False
+        self.lastFlush = 0
+        self.selector = selectors.DefaultSelector()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        # Written to by stop(), to wake the select() loop
+        self.wakeup, self.waker = socket.socketpair()
+        self.selector.register(self.wakeup, selectors.EVENT_READ)
+
+    def accept(self):
+        client, address = self.listener.accept()
+        client.setblocking(False)
+        self.buffers[client] = bytearray()
+        self.replies[client] = bytearray()
+        self.selector.register(client, selectors.EVENT_READ)
+
+    def close(self):
+        '''
+           Close every client, the listening socket, and every device
+        '''
+        for client in list(self.buffers):
+            self.disconnect(client)
+        self.selector.close()
+        self.listener.close()
+        self.wakeup.close()
+        self.waker.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        for device in self.devices.values():
+            device.close()
+        self.devices.clear()
+        return self
+
+    def disconnect(self, client):
+        self.selector.unregister(client)
+        del self.buffers[client]
+        del self.replies[client]
+        client.close()
+
+    def execute(self, client, operation, bus, address, register, payload):
+        '''
+           Apply one client request
+        '''
+        try:
+            device = self.getDevice(bus, address)
+        except (IOError, OSError) as error:
+            print("HT16K33 server: %d:0x%0.2X open failed: %s" % (bus, address, error), file=sys.stderr)
+            if operation in (READ_BYTE_DATA, READ_BLOCK):
+                self.replies[client] += REPLY.pack(0)
+            return
+        if operation == WRITE_BYTE:
+            # Latest command of each group wins (see Device.writeCommand)
+            self.commands.setdefault(device, {})[payload[0] & 0xF0] = payload[0]
+        elif operation == WRITE_BYTE_DATA:
+            device.writeRAM(register, payload[0])
+        elif operation == WRITE_BLOCK:
+            for offset, value in enumerate(payload):
+                device.writeRAM(register + offset, value)
+        else:
+            length = payload[0]
+            try:
+                if self.KEY_ADDRESS <= register <= self.INTERRUPT_ADDRESS:
+                    with device.bus.lock:
+                        values = device.bus.read_i2c_block_data(address, register, length)
+                else:
+                    values = [device.readRAM(register + offset) for offset in range(length)]
+            except (IOError, OSError) as error:
+                print("HT16K33 server: %d:0x%0.2X read failed: %s" % (bus, address, error), file=sys.stderr)
+                values = []
+            # Queued; sent by receive() once every request read is done
+            self.replies[client] += REPLY.pack(len(values)) + bytes(bytearray(values))
+
+    def flush(self):
+        '''
+           Send merged commands & display RAM of every device
+        '''
+        self.lastFlush = self.clock()
+        for device, commands in list(self.commands.items()):
+            for command in commands.values():
+                self.tryWrite(device, device.writeCommand, command)
+        self.commands.clear()
+        for device in self.devices.values():
+            if device.dirty:
+                self.tryWrite(device, device.flush)
+
+    def getDevice(self, bus, address):
+        '''
+           Return device at (bus, address), opening it on first use
+        '''
+        device = self.devices.get((bus, address))
+        if device is None:
+            device = Device(bus=bus, address=address, backend=self.backend, deferred=True)
+            # State of the chip is unknown; send everything on first flush
+            device.dirty = (1 << device.RAM_SIZE) - 1
+            self.devices[(bus, address)] = device
+        return device
+
+    def pending(self):
+        return bool(self.commands) or any(device.dirty for device in self.devices.values())
+
+    def receive(self, client):
+        '''
+           Read & apply client's requests; a malformed request (unknown
+           operation, or a payload of the wrong length) disconnects it
+
+           Example:
+           >>> import os, tempfile
+           >>> server = Server(os.path.join(tempfile.mkdtemp(), "display.sock"), backend="emulator")
+           >>> client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+           >>> client.connect(server.path)
+           >>> server.accept()
+           >>> client.sendall(MESSAGE.pack(WRITE_BYTE, 0, 0x70, 0, 0))  # no command byte
+           >>> server.receive(list(server.buffers)[0])
+           >>> client.recv(1), len(server.buffers)
+           (b'', 0)
+           >>> server = server.close()
+        '''
+        try:
+            data = client.recv(4096)
+        except (IOError, OSError):
+            data = b""
+        if not data:
+            self.disconnect(client)
+            return
+        buffer = self.buffers[client]
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= MESSAGE.size:
+            operation, bus, address, register, length = MESSAGE.unpack_from(buffer, offset)
+            end = offset + MESSAGE.size + length
+            if len(buffer) < end:
+                break
+            # Block writes carry 1 byte or more; every other operation
+            # a single byte (command, value or read length)
+            if operation >= len(OPERATIONS) or not length or (operation != WRITE_BLOCK and length != 1):
+                self.disconnect(client)
+                return
+            self.execute(client, operation, bus, address, register, buffer[offset + MESSAGE.size:end])
+            offset = end
+        del buffer[:offset]
+        if self.replies[client]:
+            self.send(client)
+
+    def send(self, client):
+        '''
+           Send as much of client's queued replies as the socket takes
+
+           Whatever is left is sent once the socket is writable; a
+           client gone away is disconnected, never stopping the server.
+        '''
+        reply = self.replies[client]
+        try:
+            sent = client.send(reply)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except (IOError, OSError):
+            self.disconnect(client)
+            return
+        del reply[:sent]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if reply else 0)
+        if self.selector.get_key(client).events != events:
+            self.selector.modify(client, events)
+
+    def serve(self):
+        '''
+           Serve clients until stop()
+        '''
+        self.running = True
+        while self.running:
+            timeout = None
+            if self.pending():
+                timeout = max(self.lastFlush + self.period - self.clock(), 0)
+            for key, events in self.selector.select(timeout):
+                if key.fileobj is self.listener:
+                    self.accept()
+                elif key.fileobj is self.wakeup:
+                    self.wakeup.recv(64)
+                else:
+                    if events & selectors.EVENT_READ:
+                        self.receive(key.fileobj)
+                    if events & selectors.EVENT_WRITE and key.fileobj in self.replies:
+                        self.send(key.fileobj)
+            if self.pending() and self.clock() >= self.lastFlush + self.period:
+                self.flush()
+        if self.pending():
+            self.flush()
+        return self
+
+    def stop(self):
+        '''
+           Stop serve() (i.e. from another thread, or a signal handler)
+        '''
+        self.running = False
+        self.waker.send(b"\x00")
+        return self
+
+    def tryWrite(self, device, method, *args):
+        try:
+            method(*args)
+        except (IOError, OSError) as error:
+            print("HT16K33 server: %d:0x%0.2X write failed: %s" % (device.busNumber, device.address, error),
+                  file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m HT16K33.server",
+                                     description="Share HT16K33 displays between processes")
+    parser.add_argument("-s", "--socket", default=SOCKET, help="Unix socket path (default %(default)s)")
+    parser.add_argument("-b", "--backend", help="bus backend (default HT16K33_BACKEND, smbus...)")
+    parser.add_argument("-r", "--rate", type=float, default=60, help="maximum flushes per second")
+    args = parser.parse_args(argv)
+
+    server = Server(args.socket, args.backend, args.rate)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())